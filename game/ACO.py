@@ -1,4 +1,5 @@
-import random
+import bisect
+import itertools
 import numpy as np
 
 
@@ -30,30 +31,33 @@ class Ant:
 
         return possible_moves
 
-    def move(self):
+    def move(self, draw=None):
         possible_moves = self.get_possible_moves(self.current_position)
 
         attractiveness_values = [
             self.aco.get_attractiveness(move) for move in possible_moves
         ]
         total_attractiveness = sum(attractiveness_values)
-        probabilities = [
-            attractiveness / total_attractiveness for attractiveness in attractiveness_values
-        ]
 
-        chosen_move = random.choices(possible_moves, probabilities)[0]
+        # draw is a uniform sample in [0, 1); the colony draws one per ant per step in a single batch
+        if draw is None:
+            draw = self.aco.rng.random()
+        cumulative = list(itertools.accumulate(attractiveness_values))
+        index = bisect.bisect_right(cumulative, draw * total_attractiveness)
+        chosen_move = possible_moves[min(index, len(possible_moves) - 1)]
 
         self.current_position = chosen_move
         self.path.append(chosen_move)
 
 
 class ACO:
-    def __init__(self, maze, num_ants, evaporation_rate, alpha, beta):
-        self.maze = maze
+    def __init__(self, maze, num_ants, evaporation_rate, alpha, beta, seed=None):
+        self.maze = np.asarray(maze)  # Maze objects and legacy grids alike
         self.num_ants = num_ants
         self.evaporation_rate = evaporation_rate
         self.alpha = alpha
         self.beta = beta
+        self.rng = np.random.default_rng(seed)  # seed is an int, None or a numpy.random.Generator
         self.pheromone = self.initialize_pheromone()
 
     def initialize_pheromone(self):
@@ -62,18 +66,12 @@ class ACO:
         pheromone[self.maze == 0] = 0  # Set pheromone on walls (0) to 0
         return pheromone
 
-    def update_pheromone_trails(self, ants):
+    def update_pheromone_trails(self, visits, path_length):
+        # visits counts, per cell, how often any ant has been there so far. Every ant deposits
+        # 1 / path length on each cell of its path, which adds up to visits / path_length.
         # Evaporate pheromone trails
         self.pheromone *= (1 - self.evaporation_rate)
-
-        # Update pheromone trails based on ant paths
-        for ant in ants:
-            path_length = self.calculate_path_length(ant.path)
-            pheromone_deposit = 1 / path_length
-            for i in range(len(ant.path) - 1):
-                current_pos = ant.path[i]
-                next_pos = ant.path[i + 1]
-                self.pheromone[current_pos, next_pos] += pheromone_deposit
+        self.pheromone += visits.reshape(self.pheromone.shape) / path_length
 
     def evaporate_pheromone(self):
         self.pheromone *= (1 - self.evaporation_rate)
@@ -89,18 +87,63 @@ class ACO:
         else:
             return 1
 
+    def attractiveness_grid(self):
+        # get_attractiveness for every cell at once, 0 on walls
+        attractiveness = np.ones(self.maze.shape)
+        attractiveness[self.maze == 4] = 2  # Rough terrain
+        attractiveness[self.maze == 5] = 0.1  # Water terrain
+        attractiveness[self.maze == 0] = 0
+        return attractiveness
+
+    def neighbor_table(self):
+        # Flat index of the cell above, below, left and right of every cell (the order
+        # Ant.get_possible_moves uses), -1 where that cell is a wall or off the grid
+        rows, cols = self.maze.shape
+        index = np.arange(rows * cols).reshape(rows, cols)
+        neighbors = np.full((rows, cols, 4), -1, dtype=np.int64)
+        neighbors[1:, :, 0] = index[:-1, :]
+        neighbors[:-1, :, 1] = index[1:, :]
+        neighbors[:, 1:, 2] = index[:, :-1]
+        neighbors[:, :-1, 3] = index[:, 1:]
+        neighbors = neighbors.reshape(-1, 4)
+        neighbors[(neighbors >= 0) & (self.maze.ravel()[neighbors] == 0)] = -1
+        return neighbors
+
     def solve(self, num_iterations):
+        # Every ant moves once per iteration. Positions live in one array, so each step is a few
+        # array operations over the whole colony: candidate moves, pheromone-weighted
+        # attractiveness, one batched draw and one deposit, whatever the number of ants.
+        cols = self.maze.shape[1]
         start_position = np.where(self.maze == 2)
         start_position = list(zip(start_position[0], start_position[1]))[0]
-        ants = [Ant(self.maze, self) for _ in range(self.num_ants)]
-
-        for _ in range(num_iterations):
-            for ant in ants:
-                ant.move()
-
-            self.update_pheromone_trails(ants)
+        neighbors = self.neighbor_table()
+        attractiveness = self.attractiveness_grid().ravel()
+        pheromone = self.pheromone.reshape(-1)  # View, so deposits show up in the next step
+        ant_index = np.arange(self.num_ants)
+
+        positions = np.full(self.num_ants, start_position[0] * cols + start_position[1])
+        paths = np.empty((num_iterations, self.num_ants), dtype=np.int64)
+        visits = np.zeros(pheromone.size)
+        draws = self.rng.random((num_iterations, self.num_ants))  # Every move of the run in one draw
+        for iteration in range(num_iterations):
+            candidates = neighbors[positions]  # (ants, 4), -1 where there is no move
+            weights = np.where(candidates >= 0,
+                               pheromone[candidates] ** self.alpha * attractiveness[candidates] ** self.beta, 0.0)
+            cumulative = weights.cumsum(axis=1)
+            total = cumulative[:, -1]
+            choice = np.minimum((cumulative <= (draws[iteration] * total)[:, None]).sum(axis=1), 3)
+            positions = np.where(total > 0, candidates[ant_index, choice], positions)  # Boxed-in ants stay
+            paths[iteration] = positions
+            np.add.at(visits, positions, 1)
+
+            self.update_pheromone_trails(visits, self.calculate_path_length(paths[:iteration + 1]))
             self.evaporate_pheromone()
 
+        ants = [Ant(self.maze, self) for _ in range(self.num_ants)]
+        for ant, path in zip(ants, paths.T.tolist()):
+            ant.path = [divmod(cell, cols) for cell in path]
+            ant.current_position = ant.path[-1] if ant.path else ant.current_position
+
         best_path = max(ants, key=lambda ant: self.calculate_path_length(ant.path)).path
 
         return best_path
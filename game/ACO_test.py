@@ -0,0 +1,13 @@
+import maze_generation
+from ACO import ACO
+
+
+def test_vectorized_colony_moves_every_ant_along_open_cells():
+    maze = maze_generation.generate_maze(20, 15, 'kruskal', seed=6, rough_density=0.2, water_density=0.2)
+    colony = ACO(maze, num_ants=200, evaporation_rate=0.1, alpha=1, beta=1, seed=2)
+    path = colony.solve(300)
+    assert path == ACO(maze, 200, 0.1, 1, 1, seed=2).solve(300)
+    assert len(path) == 300
+    for a, b in zip([maze.start] + path, path):
+        assert abs(a[0] - b[0]) + abs(a[1] - b[1]) == 1 and maze.grid[b] != 0
+    assert colony.pheromone[maze.grid == 0].max() == 0 and colony.pheromone.max() > 0
@@ -1,9 +1,10 @@
 import time
+from maze import as_maze
 
 
 class Adventurer:
     def __init__(self, maze, start_x, start_y, color='yellow', marker='o', size=100):
-        self.maze = maze
+        self.maze = as_maze(maze)
         self.x = start_x
         self.y = start_y
         self.color = color
@@ -19,7 +20,7 @@ class Adventurer:
         # Check if the new position is within the bounds of the maze
         if 0 <= new_x < self.maze.shape[1] and 0 <= new_y < self.maze.shape[0]:
             # Check if the new position is not a wall
-            if self.maze[new_y, new_x] != 0:
+            if self.maze.grid[new_y, new_x] != 0:
                 self.x = new_x
                 self.y = new_y
 
@@ -1,10 +1,26 @@
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
 import numpy as np
-import random
+from algorithms import grid_neighbors
+from maze import as_maze
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]  # Edge slots: down, up, right, left
 
 
 class AntColonyOptimization:
-    def __init__(self, maze, num_ants, num_iterations, alpha=1.0, beta=1.0, rho=0.5, q=5):
+    def __init__(self, maze, num_ants, num_iterations, alpha=1.0, beta=1.0, rho=0.5, q=5, seed=None,
+                 max_steps=None):
         self.maze = maze
+        # seed is an int, None or a numpy.random.Generator. The seed sequence is kept to spawn the
+        # workers' RNGs from; Generator.bit_generator.seed_seq needs numpy 1.25.
+        if isinstance(seed, np.random.Generator):
+            self.rng = seed
+            self.seed_sequence = np.random.SeedSequence(int(seed.integers(2 ** 63)))
+        else:
+            self.seed_sequence = np.random.SeedSequence(seed)
+            self.rng = np.random.default_rng(self.seed_sequence)
+        self.draws = []  # Uniform samples drawn from rng in batches, consumed by select_next_node
         self.num_ants = num_ants
         self.num_iterations = num_iterations
         self.alpha = alpha  # Pheromone factor
@@ -13,141 +29,216 @@ class AntColonyOptimization:
         self.q = q          # Pheromone deposit quantity
 
         self.num_nodes = maze.size
-        self.pheromone = np.ones((self.num_nodes, self.num_nodes))  # Pheromone matrix
-        self.heuristic = self.calculate_heuristic()  # Heuristic matrix
+        self.neighbors = self.calculate_neighbors()  # Neighbour of every cell per direction slot, -1 if none
+        self.neighbor_lists = self.neighbors.tolist()  # Same table as lists, for the per-step walk
+        self.pheromone = np.where(self.neighbors >= 0, 1.0, 0.0)  # Pheromone per edge slot
+        self.heuristic = self.calculate_heuristic()  # Heuristic per edge slot
+
+        # Start and every exit (3.1/3.2/3.3 on legacy grids, 3 on integer grids) as flat indices
+        adapted = as_maze(maze)
+        self.start = int(np.ravel_multi_index(adapted.start, adapted.shape))
+        self.ends = set(int(np.ravel_multi_index(end, adapted.shape)) for end in adapted.exits)
+        # Moves an ant may make, backtracking included; a tabu walk needs at most 2 per cell
+        self.max_steps = 2 * self.num_nodes if max_steps is None else max_steps
+
+    def calculate_neighbors(self):
+        # Edges are stored per cell in four direction slots, in the order of DIRECTIONS, so
+        # pheromone and heuristic take O(cells) memory instead of a num_nodes x num_nodes matrix
+        open_cells = np.asarray(self.maze).ravel() != 0
+        neighbors = grid_neighbors(self.maze.shape)
+        neighbors[(neighbors >= 0) & ~open_cells[neighbors]] = -1  # Walls are not neighbours
+        return neighbors
 
     def calculate_heuristic(self):
-        heuristic = np.zeros((self.num_nodes, self.num_nodes))
-        for i in range(self.num_nodes):
-            x1, y1 = np.unravel_index(i, self.maze.shape)
-            for j in range(self.num_nodes):
-                x2, y2 = np.unravel_index(j, self.maze.shape)
-                heuristic[i, j] = abs(x1 - x2) + abs(y1 - y2)
-        return heuristic
+        # Manhattan distance along each edge: 1 for every edge, 0 in the empty slots
+        return (self.neighbors >= 0).astype(float)
+
+    def edge_slots(self, nodes, neighbors):
+        # Direction slot of the edge from each node to its neighbour (flat indices, arrays or scalars)
+        step = np.asarray(neighbors) - np.asarray(nodes)
+        cols = self.maze.shape[1]
+        return np.select([step == cols, step == -cols, step == 1], [0, 1, 2], 3)
 
     def get_neighbors(self, node):
-        neighbors = []
-        x, y = np.unravel_index(node, self.maze.shape)
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        for dx, dy in directions:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self.maze.shape[0] and 0 <= ny < self.maze.shape[1] and self.maze[nx, ny] != 0:
-                neighbors.append(np.ravel_multi_index((nx, ny), self.maze.shape))
-        return neighbors
+        return [neighbor for neighbor in self.neighbors[node].tolist() if neighbor >= 0]
 
-    def ant_colony_optimization(self):
+    def ant_colony_optimization(self, workers=1):
+        # workers > 1 builds each iteration's ants on a process pool. The ants of one iteration
+        # only read the pheromone, so the workers map it from shared memory and this process
+        # merges their paths into a single update_pheromone once they are all back.
         best_path = None
         best_path_length = float('inf')
-
-        for iteration in range(self.num_iterations):
-            paths = []
-            path_lengths = []
-
-            for ant in range(self.num_ants):
-                path = self.construct_path()
-                paths.append(path)
-
-                path_length = self.calculate_path_length(path)
-                path_lengths.append(path_length)
-
-                if path_length < best_path_length:
-                    best_path = path
-                    best_path_length = path_length
-
-            self.update_pheromone(paths, path_lengths)
-            self.evaporate_pheromone()
+        pool = self.start_workers(workers) if workers > 1 else None
+
+        try:
+            for iteration in range(self.num_iterations):
+                if pool is None:
+                    paths = [self.construct_path() for ant in range(self.num_ants)]
+                else:
+                    paths = self.construct_parallel(pool, workers)
+                paths = [path for path in paths if path is not None]  # Ants that ran out of steps
+                path_lengths = [self.calculate_path_length(path) for path in paths]
+
+                for path, path_length in zip(paths, path_lengths):
+                    if path_length < best_path_length:
+                        best_path = path
+                        best_path_length = path_length
+
+                self.update_pheromone(paths, path_lengths)  # Evaporates once, then deposits
+        finally:
+            if pool is not None:
+                self.stop_workers(pool)
 
         return best_path
 
-    def construct_path(self):
-        start = self.find_start()
-        end = self.find_end()
-
-        path = [start]
-        visited = set()
-        visited.add(start)
+    def start_workers(self, workers):
+        # Moves the pheromone into a shared-memory segment that the workers attach to, so the
+        # in-place updates of update_pheromone are visible to them without copying
+        segment = shared_memory.SharedMemory(create=True, size=self.pheromone.nbytes)
+        shared = np.ndarray(self.pheromone.shape, dtype=self.pheromone.dtype, buffer=segment.buf)
+        shared[:] = self.pheromone
+        self.pheromone = shared
+        settings = (self.maze, self.alpha, self.beta, self.rho, self.q, self.max_steps)
+        executor = ProcessPoolExecutor(workers, initializer=attach_worker, initargs=(settings, segment.name))
+        return executor, segment
+
+    def stop_workers(self, pool):
+        executor, segment = pool
+        executor.shutdown()
+        self.pheromone = np.array(self.pheromone)  # Back to private memory before the segment goes
+        segment.close()
+        segment.unlink()
+
+    def construct_parallel(self, pool, workers):
+        # One task per worker, each with its own RNG spawned from this colony's seed sequence, so
+        # a seeded run gives the same paths for the same number of workers
+        executor, segment = pool
+        counts = [len(chunk) for chunk in np.array_split(np.arange(self.num_ants), workers) if len(chunk)]
+        seeds = self.seed_sequence.spawn(len(counts))
+        paths = []
+        for chunk in executor.map(construct_ants, counts, seeds):
+            paths.extend(chunk)
+        return paths
 
-        current = start
-        while current != end:
+    def construct_path(self):
+        # Tabu walk from the start to the first exit reached: visited cells are never entered
+        # again, a dead end sends the ant one step back along its path, and the walk gives up
+        # after max_steps moves. Returns the path without the backtracked detours, or None.
+        path = [self.start]
+        visited = {self.start}
+
+        for step in range(self.max_steps):
+            current = path[-1]
+            if current in self.ends:
+                return path
             next_node = self.select_next_node(current, visited)
+            if next_node is None:
+                path.pop()  # Dead end: back up and try another branch
+                if not path:
+                    return None  # Every reachable cell was visited without finding an exit
+                continue
             path.append(next_node)
             visited.add(next_node)
-            current = next_node
 
-        return path
+        return path if path[-1] in self.ends else None
 
     def select_next_node(self, current, visited):
-        neighbors = self.get_neighbors(current)
-        probabilities = self.calculate_probabilities(current, neighbors)
-
-        if len(neighbors) == 0 or len(probabilities) == 0:
+        neighbors = [neighbor for neighbor in self.neighbor_lists[current] if neighbor >= 0 and neighbor not in visited]
+        if len(neighbors) == 0:
             return None
 
-        next_node = random.choices(neighbors, probabilities, k=1)[0]
+        probabilities = self.calculate_probabilities(current, neighbors)
+        next_node = neighbors[self.pick(probabilities)]
         return next_node
 
-    def calculate_probabilities(self, current, neighbors):
-        probabilities = []
-        total = 0.0
-
-        for neighbor in neighbors:
-            pheromone = self.pheromone[current, neighbor]
-            heuristic = self.heuristic[current, neighbor]
-            probability = (pheromone ** self.alpha) * ((1.0 / heuristic) ** self.beta)
-            probabilities.append(probability)
-            total += probability
+    def pick(self, probabilities):
+        # Index chosen with the given probabilities, using the next uniform from the batch
+        if not self.draws:
+            self.draws = self.rng.random(4096).tolist()
+        draw = self.draws.pop()
+        cumulative = 0.0
+        for i, probability in enumerate(probabilities):
+            cumulative += probability
+            if draw < cumulative:
+                return i
+        return len(probabilities) - 1
 
-        probabilities = [p / total for p in probabilities]
-        return probabilities
+    def calculate_probabilities(self, current, neighbors):
+        # Plain floats: per-step numpy calls on four-element arrays would dominate the walk
+        slots = self.neighbor_lists[current]
+        pheromone = self.pheromone[current].tolist()
+        heuristic = self.heuristic[current].tolist()
+        weights = [(pheromone[slots.index(neighbor)] ** self.alpha) *
+                   ((1.0 / heuristic[slots.index(neighbor)]) ** self.beta) for neighbor in neighbors]
+        total = sum(weights)
+        return [weight / total for weight in weights]
 
     def update_pheromone(self, paths, path_lengths):
-        for i in range(self.num_nodes):
-            for j in range(self.num_nodes):
-                delta_pheromone = 0
-                for path, length in zip(paths, path_lengths):
-                    if j in path:
-                        path_index = path.index(j)
-                        if path_index < len(path) - 1 and path[path_index + 1] == i:
-                            delta_pheromone += self.q / length
-                self.pheromone[i, j] = (1 - self.rho) * self.pheromone[i, j] + delta_pheromone
+        # The edges of all paths go into flat arrays and their q / length deposits, in both
+        # directions, are summed per edge slot with one bincount. Cost is proportional to the
+        # total path length, plus one pass over the pheromone array for evaporation.
+        sources, targets, deposits = [], [], []
+        for path, length in zip(paths, path_lengths):
+            if len(path) > 1:
+                path = np.asarray(path, dtype=np.int64)
+                sources.append(path[:-1])
+                targets.append(path[1:])
+                deposits.append(np.full(len(path) - 1, self.q / length))
+
+        self.evaporate_pheromone()
+        if not sources:
+            return
+        sources, targets, deposits = np.concatenate(sources), np.concatenate(targets), np.concatenate(deposits)
+        edges = np.concatenate((sources * 4 + self.edge_slots(sources, targets),
+                                targets * 4 + self.edge_slots(targets, sources)))
+        delta = np.bincount(edges, weights=np.concatenate((deposits, deposits)), minlength=self.pheromone.size)
+        self.pheromone += delta.reshape(self.pheromone.shape)
 
     def evaporate_pheromone(self):
-        self.pheromone *= self.rho
+        self.pheromone *= 1 - self.rho
 
     def calculate_path_length(self, path):
-        length = 0
-        for i in range(len(path) - 1):
-            current = path[i]
-            next_node = path[i + 1]
-            length += self.heuristic[current, next_node]
-        return length
+        path = np.asarray(path, dtype=np.int64)
+        return self.heuristic[path[:-1], self.edge_slots(path[:-1], path[1:])].sum()
 
     def find_start(self):
-        indices = np.where(self.maze == 2)
-        if len(indices[0]) > 0 and len(indices[1]) > 0:
-            return np.ravel_multi_index((indices[0][0], indices[1][0]), self.maze.shape)
-        return None
+        return self.start
 
     def find_end(self):
-        indices = np.where(self.maze == 3)
-        if len(indices[0]) > 0 and len(indices[1]) > 0:
-            return np.ravel_multi_index((indices[0][0], indices[1][0]), self.maze.shape)
-        return None
+        # The first exit; construct_path accepts any of them
+        return min(self.ends)
+
+
+
+worker_colony = None  # Colony of the current worker process, set up by attach_worker
+worker_segment = None
+
 
+def attach_worker(settings, name):
+    global worker_colony, worker_segment
+    maze, alpha, beta, rho, q, max_steps = settings
+    worker_colony = AntColonyOptimization(maze, 0, 0, alpha, beta, rho, q, max_steps=max_steps)
+    worker_segment = shared_memory.SharedMemory(name=name)
+    worker_colony.pheromone = np.ndarray(worker_colony.pheromone.shape, dtype=float, buffer=worker_segment.buf)
 
 
-# Generate a maze
-maze = np.array([
-    [1, 1, 1, 1, 1],
-    [2, 0, 0, 0, 1],
-    [1, 1, 1, 1, 1],
-    [1, 0, 0, 0, 3],
-    [1, 1, 1, 1, 1]
-])
+def construct_ants(count, seed_sequence):
+    worker_colony.rng = np.random.default_rng(seed_sequence)
+    worker_colony.draws = []
+    return [worker_colony.construct_path() for ant in range(count)]
 
-# Run Ant Colony Optimization
-aco = AntColonyOptimization(maze, num_ants=5, num_iterations=10)
-best_path = aco.ant_colony_optimization()
-print("Best Path:", best_path)
 
+if __name__ == "__main__":
+    # Generate a maze
+    maze = np.array([
+        [1, 1, 1, 1, 1],
+        [2, 0, 0, 0, 1],
+        [1, 1, 1, 1, 1],
+        [1, 0, 0, 0, 3],
+        [1, 1, 1, 1, 1]
+    ])
 
+    # Run Ant Colony Optimization
+    aco = AntColonyOptimization(maze, num_ants=5, num_iterations=10)
+    best_path = aco.ant_colony_optimization()
+    print("Best Path:", best_path)
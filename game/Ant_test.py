@@ -0,0 +1,75 @@
+import numpy as np
+
+import maze_generation
+from algorithms import get_neighbors, verify_path_algorithm
+from Ant import AntColonyOptimization
+
+
+def test_ant_colony_stores_pheromone_per_edge():
+    maze = maze_generation.generate_maze(100, 100, 'kruskal', seed=1).to_legacy()
+    colony = AntColonyOptimization(maze, num_ants=5, num_iterations=1, seed=0)
+    assert colony.pheromone.shape == colony.heuristic.shape == (maze.size, 4)
+    node = int(np.ravel_multi_index(maze_generation.as_maze(maze).start, maze.shape))
+    assert sorted(colony.get_neighbors(node)) == sorted(
+        int(np.ravel_multi_index(n, maze.shape)) for n in get_neighbors(divmod(node, maze.shape[1]), maze))
+
+    maze = np.array([[1, 1, 1, 1, 1],
+                     [2, 0, 0, 0, 1],
+                     [1, 1, 1, 1, 1],
+                     [1, 0, 0, 0, 3],
+                     [1, 1, 1, 1, 1]])
+    paths = [AntColonyOptimization(maze, num_ants=5, num_iterations=10, seed=4).ant_colony_optimization()
+             for _ in range(2)]
+    assert paths[0] == paths[1]
+    for a, b in zip(paths[0], paths[0][1:]):
+        assert abs(a - b) in (1, 5) and maze.flat[b] != 0
+
+
+def test_ant_colony_pheromone_update_evaporates_once():
+    maze = np.ones((3, 4))
+    maze[0, 0], maze[2, 3] = 2, 3
+    colony = AntColonyOptimization(maze, num_ants=2, num_iterations=1, rho=0.25, q=6)
+    before = colony.pheromone.copy()
+    paths = [[0, 1, 5, 6], [0, 1], [7]]
+    colony.update_pheromone(paths, [colony.calculate_path_length(path) for path in paths])
+
+    expected = before * 0.75
+    for path, deposit in ((paths[0], 2.0), (paths[1], 6.0)):
+        for a, b in zip(path, path[1:]):
+            expected[a, colony.edge_slots(a, b)] += deposit
+            expected[b, colony.edge_slots(b, a)] += deposit
+    assert np.allclose(colony.pheromone, expected)
+
+
+def test_ant_colony_builds_ants_in_parallel():
+    maze = np.array([[1, 1, 1, 1, 1],
+                     [2, 0, 0, 0, 1],
+                     [1, 1, 1, 1, 1],
+                     [1, 0, 0, 0, 3],
+                     [1, 1, 1, 1, 1]])
+    colonies = [AntColonyOptimization(maze, num_ants=6, num_iterations=5, seed=8) for _ in range(2)]
+    paths = [colony.ant_colony_optimization(workers=2) for colony in colonies]
+    assert paths[0] == paths[1]
+    assert paths[0][0] == 5 and paths[0][-1] == 19
+    assert np.allclose(colonies[0].pheromone, colonies[1].pheromone)
+    assert colonies[0].pheromone.max() > 1  # Deposits from the workers' paths were merged
+
+    # A Generator seed is as reproducible as an int one
+    colonies = [AntColonyOptimization(maze, num_ants=6, num_iterations=5, seed=np.random.default_rng(8))
+                for _ in range(2)]
+    assert colonies[0].ant_colony_optimization(workers=2) == colonies[1].ant_colony_optimization(workers=2)
+
+
+def test_ant_walks_are_bounded_on_generated_mazes():
+    for seed, generator in enumerate(['dfs', 'kruskal', 'division']):
+        maze = maze_generation.generate_maze(15, 12, generator, seed=seed)
+        for grid in (maze, maze.to_legacy()):  # Exit codes 3 and 3.1/3.2/3.3
+            colony = AntColonyOptimization(grid, num_ants=4, num_iterations=3, seed=seed)
+            path = [divmod(node, maze.shape[1]) for node in colony.ant_colony_optimization()]
+            assert path[0] == maze.start and path[-1] in maze.exits
+            assert verify_path_algorithm(path, maze)
+            assert len(set(path)) == len(path)  # Backtracked detours are not part of the path
+
+    colony = AntColonyOptimization(maze, num_ants=4, num_iterations=3, seed=0, max_steps=5)
+    assert colony.construct_path() is None
+    assert colony.ant_colony_optimization() is None
@@ -0,0 +1,154 @@
+import heapq
+import numpy as np
+from maze import as_maze
+
+
+class DStarLite:
+    # Incremental shortest-path planner (D* Lite, Koenig & Likhachev) for mazes whose walls and
+    # terrain change at runtime. The search runs backwards from every exit to the start and keeps
+    # its g/rhs values between calls, so after update_cells only the part of the shortest-path
+    # tree whose costs changed is repaired. move_start follows the adventurer without replanning.
+    # Exits are fixed when the planner is created. Paths are lists of (row, col) like the solvers
+    # in algorithms.py, from the current start to the nearest exit.
+    def __init__(self, maze):
+        maze = as_maze(maze)
+        self.rows, self.cols = maze.shape
+        self.cells = np.array(maze.grid, dtype=np.uint8).ravel().tolist()
+        self.start = maze.start[0] * self.cols + maze.start[1]
+        self.last_start = self.start
+        self.exits = set(row * self.cols + col for row, col in maze.exits)
+        self.km = 0  # Accumulated heuristic offset from moving the start
+        self.expanded = 0
+
+        size = self.rows * self.cols
+        self.g = [float('inf')] * size
+        self.rhs = [float('inf')] * size
+        self.queue = []
+        self.queued = {}  # node -> key of its live heap entry; other heap entries are stale
+        for end in self.exits:
+            self.rhs[end] = 0
+            self.push(end)
+
+    def plan(self):
+        self.compute_shortest_path()
+        return self.extract_path()
+
+    def update_cells(self, changes):
+        # changes is an iterable of ((row, col), value) pairs, e.g. 0 for a new wall or 5 for a
+        # flooded cell. The whole batch is applied before the search is repaired.
+        affected = set()
+        for (row, col), value in changes:
+            node = row * self.cols + col
+            if self.cells[node] == value:
+                continue
+            self.cells[node] = value
+            affected.add(node)
+            affected.update(self.neighbors(node))
+        for node in affected:
+            self.update_vertex(node)
+        return self.plan()
+
+    def move_start(self, position):
+        # The adventurer moved to position (row, col); keys already queued stay valid lower bounds
+        start = position[0] * self.cols + position[1]
+        self.km += self.h(self.last_start, start)
+        self.last_start = start
+        self.start = start
+        return self.plan()
+
+    def compute_shortest_path(self):
+        g, rhs = self.g, self.rhs
+        while True:
+            top = self.top()
+            if top is None:
+                break
+            key, node = top
+            if key >= self.key(self.start) and rhs[self.start] == g[self.start]:
+                break
+
+            new_key = self.key(node)
+            if key < new_key:
+                self.push(node, new_key)  # Key went stale because the start moved
+                continue
+
+            del self.queued[node]
+            self.expanded += 1
+            if g[node] > rhs[node]:
+                g[node] = rhs[node]  # Over-consistent: settle it and relax its neighbours
+                for neighbor in self.neighbors(node):
+                    if neighbor not in self.exits:
+                        rhs[neighbor] = min(rhs[neighbor], self.cost(neighbor, node) + g[node])
+                    self.update_queue(neighbor)
+            else:
+                g[node] = float('inf')  # Under-consistent: its cost went up, recompute around it
+                self.update_vertex(node)
+                for neighbor in self.neighbors(node):
+                    self.update_vertex(neighbor)
+
+    def update_vertex(self, node):
+        if node not in self.exits:
+            self.rhs[node] = min((self.cost(node, neighbor) + self.g[neighbor]
+                                  for neighbor in self.neighbors(node)), default=float('inf'))
+        self.update_queue(node)
+
+    def update_queue(self, node):
+        if self.g[node] != self.rhs[node]:
+            self.push(node)
+        else:
+            self.queued.pop(node, None)
+
+    def push(self, node, key=None):
+        key = self.key(node) if key is None else key
+        self.queued[node] = key
+        heapq.heappush(self.queue, (key, node))
+
+    def top(self):
+        # Smallest live entry, dropping stale ones left behind by re-keying or removal
+        while self.queue:
+            key, node = self.queue[0]
+            if self.queued.get(node) == key:
+                return key, node
+            heapq.heappop(self.queue)
+        return None
+
+    def key(self, node):
+        best = min(self.g[node], self.rhs[node])
+        return best + self.h(self.start, node) + self.km, best
+
+    def h(self, a, b):
+        row_a, col_a = divmod(a, self.cols)
+        row_b, col_b = divmod(b, self.cols)
+        return abs(row_a - row_b) + abs(col_a - col_b)
+
+    def neighbors(self, node):
+        row, col = divmod(node, self.cols)
+        if row + 1 < self.rows:
+            yield node + self.cols
+        if row > 0:
+            yield node - self.cols
+        if col + 1 < self.cols:
+            yield node + 1
+        if col > 0:
+            yield node - 1
+
+    def cost(self, a, b):
+        # Same edge costs as algorithms.get_edge_cost, infinite into or out of a wall
+        cell_a, cell_b = self.cells[a], self.cells[b]
+        if cell_a == 0 or cell_b == 0:
+            return float('inf')
+        if cell_a == 4 or cell_b == 4:  # Rough terrain
+            return 2
+        if cell_a == 5 or cell_b == 5:  # Water terrain
+            return 3
+        return 1
+
+    def extract_path(self):
+        # Greedy descent on g from the start; every step follows a cheapest edge toward an exit
+        if self.g[self.start] == float('inf') or self.cells[self.start] == 0:
+            return None
+        current = self.start
+        path = [divmod(current, self.cols)]
+        while current not in self.exits:
+            current = min(self.neighbors(current), key=lambda neighbor: self.cost(current, neighbor) + self.g[neighbor])
+            path.append(divmod(current, self.cols))
+        return path
@@ -0,0 +1,56 @@
+import numpy as np
+
+import maze_generation
+from algorithms import dijkstra, path_cost, verify_path_algorithm
+from maze import Maze
+from DStarLite import DStarLite
+
+
+def test_d_star_lite_repairs_after_cell_changes():
+    rng = np.random.default_rng(3)
+    for seed in range(10):
+        maze = maze_generation.generate_maze(12, 10, 'kruskal', seed=seed, rough_density=0.1, water_density=0.1)
+        grid = maze.grid.copy()
+        grid[(grid == 0) & (rng.random(grid.shape) < 0.3)] = 1  # Open some walls so there are alternatives
+        planner = DStarLite(Maze(grid, maze.start, maze.exits))
+        start = maze.start
+        path = planner.plan()
+        for _ in range(5):
+            if len(path) > 2:
+                start = path[1]
+                path = planner.move_start(start)
+            changes = [(path[len(path) // 2], 0), (path[len(path) // 3], 5)]
+            changes = [(cell, value) for cell, value in changes if cell != start and cell not in maze.exits]
+            for cell, value in changes:
+                grid[cell] = value
+            path = planner.update_cells(changes)
+            current = Maze(grid, start, maze.exits)
+            expected = dijkstra(current)
+            if expected is None:
+                assert path is None
+                break
+            assert verify_path_algorithm(path, current)
+            assert path_cost(path, current) == path_cost(expected, current)
+
+
+
+def test_d_star_lite_repairs_after_cost_drops():
+    rng = np.random.default_rng(5)
+    for seed in range(10):
+        maze = maze_generation.generate_maze(12, 10, 'kruskal', seed=seed, rough_density=0.3, water_density=0.3)
+        grid = maze.grid.copy()
+        planner = DStarLite(Maze(grid, maze.start, maze.exits))
+        planner.plan()
+        for _ in range(5):
+            # Open some walls and drain some terrain, so shortcuts appear and costs only go down
+            walls = np.argwhere(grid == 0)
+            terrain = np.argwhere(grid >= 4)
+            cells = [tuple(cell) for cell in walls[rng.choice(len(walls), 4, replace=False)]]
+            cells += [tuple(cell) for cell in terrain[rng.choice(len(terrain), min(4, len(terrain)), replace=False)]]
+            changes = [(cell, 1) for cell in cells]
+            for cell, value in changes:
+                grid[cell] = value
+            path = planner.update_cells(changes)
+            current = Maze(grid, maze.start, maze.exits)
+            assert verify_path_algorithm(path, current)
+            assert path_cost(path, current) == path_cost(dijkstra(current), current)
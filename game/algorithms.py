@@ -1,225 +1,765 @@
 import numpy as np
-from queue import Queue
-from queue import PriorityQueue
 import heapq
-
-
-
-def dijkstra(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
+import hashlib
+from collections import deque
+from collections import namedtuple
+from collections import OrderedDict
+from maze import as_maze
+
+
+MazeGraph = namedtuple('MazeGraph', ['indptr', 'indices', 'weights', 'cells', 'shape', 'start', 'exits'])
+DistanceField = namedtuple('DistanceField', ['distance', 'next_hop'])
+Contraction = namedtuple('Contraction', ['graph', 'corridors', 'kept'])
+
+FIELD_CACHE_SIZE = 32
+field_cache = OrderedDict()  # maze_key -> DistanceField, least recently used first
+
+
+def compile_graph(maze):
+    # One-time compile of a maze into a CSR graph over flat cell indices (row * cols + col):
+    # the neighbours of node u are indices[indptr[u]:indptr[u + 1]], in get_neighbors order,
+    # with the get_edge_cost of each edge in weights. Solvers take a maze or a compiled graph.
+    if isinstance(maze, MazeGraph):
+        return maze
+    maze = as_maze(maze)
+    rows, cols = maze.shape
+    cells = maze.grid.ravel()
+    neighbors = grid_neighbors((rows, cols), np.int32)
+    valid = (neighbors >= 0) & (cells != 0)[:, None] & (cells[neighbors] != 0)
+
+    degree = valid.sum(axis=1)
+    indptr = np.zeros(rows * cols + 1, dtype=np.int64)
+    np.cumsum(degree, out=indptr[1:])
+    indices = neighbors[valid]
+    weights = edge_costs(np.repeat(cells, degree), cells[indices])
+
+    start = maze.start[0] * cols + maze.start[1]
+    exits = tuple(row * cols + col for row, col in maze.exits)
+    return MazeGraph(indptr, indices, weights, cells, (rows, cols), start, exits)
+
+
+def grid_neighbors(shape, dtype=np.int64):
+    # Flat index of the neighbour of every cell in get_neighbors order (down, up, right, left),
+    # as a (rows * cols, 4) table with -1 where a neighbour would fall off the grid
+    rows, cols = shape
+    index = np.arange(rows * cols, dtype=dtype).reshape(rows, cols)
+    neighbors = np.full((rows, cols, 4), -1, dtype=dtype)
+    neighbors[:-1, :, 0] = index[1:, :]  # (1, 0)
+    neighbors[1:, :, 1] = index[:-1, :]  # (-1, 0)
+    neighbors[:, :-1, 2] = index[:, 1:]  # (0, 1)
+    neighbors[:, 1:, 3] = index[:, :-1]  # (0, -1)
+    return neighbors.reshape(-1, 4)
+
+
+def edge_costs(terrain_type1, terrain_type2):
+    # Vectorized get_edge_cost
+    return np.where((terrain_type1 == 4) | (terrain_type2 == 4), 2,  # Rough terrain
+                    np.where((terrain_type1 == 5) | (terrain_type2 == 5), 3, 1)).astype(np.int8)  # Water terrain
+
+
+def graph_lists(graph):
+    # Plain Python lists index far faster than NumPy scalars inside the search loops
+    return graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+
+
+def dijkstra(maze, stats=None, queue='heap'):
+    # stats, if given a dict, receives the number of expanded nodes under 'expanded'.
+    # queue='dial' runs the same search on a bucket queue instead of the binary heap.
+    if queue == 'dial':
+        return dial(maze, stats)
+    if queue != 'heap':
+        raise ValueError("Unknown queue: " + str(queue) + ". Choose from heap, dial")
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
     pq = [(0, start)]
-    visited = set()
-    distances = {start: 0}
-    parent = {}
+    distances = [float('inf')] * len(graph.cells)
+    distances[start] = 0
+    parent = [-1] * len(graph.cells)
+    expanded = 0
 
     while pq:
         current_cost, current = heapq.heappop(pq)
 
-        if current in end_positions:
-            return reconstruct_path(parent, current)
+        if current_cost > distances[current]:
+            continue  # Stale entry, the node was already expanded at a lower cost
 
-        visited.add(current)
+        if current in end_positions:
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, current, graph)
 
-        neighbors = get_neighbors(current, maze)
+        expanded += 1
 
-        for neighbor in neighbors:
-            edge_cost = get_edge_cost(current, neighbor, maze)
-            new_cost = distances[current] + edge_cost
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            new_cost = distances[current] + weights[i]
 
-            if neighbor not in distances or new_cost < distances[neighbor]:
+            if new_cost < distances[neighbor]:
                 distances[neighbor] = new_cost
                 heapq.heappush(pq, (new_cost, neighbor))
                 parent[neighbor] = current
 
+    record_stats(stats, expanded)
     return None
 
 
-def a_star(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
-    queue = PriorityQueue()
-    queue.put((0, start))
-    visited = set()
-    parent = {}
-    g_score = {start: 0}
-    f_score = {start: heuristic(start, end_positions, maze)}
+def dial(maze, stats=None):
+    # Dial's algorithm: Dijkstra on a bucket queue. Edge costs are 1, 2 or 3, so every tentative
+    # distance lies within 3 of the one being expanded and four circular buckets hold the whole
+    # frontier. Each push and pop is O(1), giving O(V + E + C) instead of O(E log V).
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    buckets = [[] for _ in range(int(graph.weights.max(initial=1)) + 1)]
+    buckets[0].append(start)
+    pending = 1  # Entries left across all buckets, stale ones included
+    distances = [float('inf')] * len(graph.cells)
+    distances[start] = 0
+    parent = [-1] * len(graph.cells)
+    current_cost = 0
+    expanded = 0
+
+    while pending:
+        bucket = buckets[current_cost % len(buckets)]
+        while bucket:
+            current = bucket.pop()
+            pending -= 1
+
+            if distances[current] != current_cost:
+                continue  # Stale entry, the node was already expanded at a lower cost
+
+            if current in end_positions:
+                record_stats(stats, expanded)
+                return reconstruct_flat_path(parent, current, graph)
+
+            expanded += 1
+
+            for i in range(indptr[current], indptr[current + 1]):
+                neighbor = indices[i]
+                new_cost = current_cost + weights[i]
+
+                if new_cost < distances[neighbor]:
+                    distances[neighbor] = new_cost
+                    buckets[new_cost % len(buckets)].append(neighbor)
+                    pending += 1
+                    parent[neighbor] = current
+        current_cost += 1
+
+    record_stats(stats, expanded)
+    return None
 
-    while not queue.empty():
-        current_cost, current = queue.get()
 
-        if current in end_positions:
-            return reconstruct_path(parent, current)
+def a_star(maze, field='manhattan', stats=None):
+    # field is the heuristic: 'manhattan' (distance to the nearest exit, computed for every cell
+    # in one vectorized pass), 'exact' (reverse Dijkstra from all exits) or an array from
+    # heuristic_field. Both are admissible and consistent, so the returned path is optimal.
+    if isinstance(field, str) and field not in ('manhattan', 'exact'):
+        raise ValueError("Unknown heuristic field: " + field + ". Choose from manhattan, exact")
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    h_score = (heuristic_field(graph, exact=field == 'exact') if isinstance(field, str) else field).ravel().tolist()
+    queue = [(h_score[start], h_score[start], start)]
+    closed = [False] * len(h_score)
+    parent = [-1] * len(h_score)
+    g_score = [float('inf')] * len(h_score)
+    g_score[start] = 0
+    expanded = 0
+
+    while queue:
+        current_cost, current_h, current = heapq.heappop(queue)
+
+        if closed[current]:
+            continue  # Stale entry left behind by a later improvement (lazy deletion)
 
-        visited.add(current)
+        if current in end_positions:
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, current, graph)
 
-        neighbors = get_neighbors(current, maze)
+        closed[current] = True
+        expanded += 1
 
-        for neighbor in neighbors:
-            edge_cost = get_edge_cost(current, neighbor, maze)
-            g = g_score[current] + edge_cost
-            if neighbor not in g_score or g < g_score[neighbor]:
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            g = g_score[current] + weights[i]
+            if g < g_score[neighbor] and not closed[neighbor]:
                 parent[neighbor] = current
                 g_score[neighbor] = g
-                f_score[neighbor] = g + heuristic(neighbor, end_positions, maze)
-                if neighbor not in visited:
-                    queue.put((f_score[neighbor], neighbor))
+                heapq.heappush(queue, (g + h_score[neighbor], h_score[neighbor], neighbor))  # Ties: closest to an exit first
 
+    record_stats(stats, expanded)
     return None
 
 
-def ucs(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
-    priority_queue = PriorityQueue()
-    priority_queue.put((0, start))
-    visited = set()
-    distances = {start: 0}
-    parent = {}
-
-    while not priority_queue.empty():
-        current_cost, current = priority_queue.get()
-
-        if current in end_positions:
-            return reconstruct_path(parent, current)
+def heuristic_field(maze, exact=False):
+    # Lower bound on the cost from every cell to its nearest exit, shaped like the maze.
+    # Manhattan distance is admissible because every step costs at least 1; exact=True
+    # runs one multi-source Dijkstra from all exits instead, giving the true remaining cost.
+    graph = compile_graph(maze)
+    rows, cols = graph.shape
+    if exact:
+        distances = distance_field(graph).distance.astype(float)
+        distances[distances < 0] = float('inf')
+        return distances
+
+    row_index, col_index = np.indices((rows, cols))
+    field = np.full((rows, cols), np.iinfo(np.int32).max, dtype=np.int32)
+    for end in graph.exits:
+        end_row, end_col = divmod(end, cols)
+        np.minimum(field, np.abs(row_index - end_row) + np.abs(col_index - end_col), out=field)
+    return field
+
+
+def exit_distances(graph):
+    # Multi-source Dijkstra seeded with every exit at cost 0. Edge costs are symmetric, so the
+    # result is the cost from each cell to its nearest exit (inf where no exit is reachable),
+    # plus the neighbour to step to from each cell on a cheapest route there (-1 at exits).
+    indptr, indices, weights = graph_lists(graph)
+    distances = [float('inf')] * len(graph.cells)
+    next_hop = [-1] * len(graph.cells)
+    pq = []
+    for end in graph.exits:
+        distances[end] = 0
+        pq.append((0, end))
+    heapq.heapify(pq)
 
-        visited.add(current)
+    while pq:
+        current_cost, current = heapq.heappop(pq)
+        if current_cost > distances[current]:
+            continue
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            new_cost = current_cost + weights[i]
+            if new_cost < distances[neighbor]:
+                distances[neighbor] = new_cost
+                next_hop[neighbor] = current
+                heapq.heappush(pq, (new_cost, neighbor))
 
-        neighbors = get_neighbors(current, maze)
+    return distances, next_hop
+
+
+def distance_field(maze):
+    # Cost from every cell to its nearest exit and the flat index (row * cols + col) of the next
+    # cell on the way there, as int32 arrays shaped like the maze. Unreachable cells and walls
+    # hold -1 in both; exits hold distance 0 and next hop -1. Fields are computed in one pass
+    # from all exits and cached by maze content, so repeated queries on a maze are lookups.
+    # The returned arrays are shared with the cache and therefore read-only.
+    key = maze_key(maze)
+    if key in field_cache:
+        field_cache.move_to_end(key)
+        return field_cache[key]
+
+    graph = compile_graph(maze)
+    distances, next_hop = exit_distances(graph)
+    distance = np.array(distances, dtype=float)
+    distance[np.isinf(distance)] = -1
+    distance = distance.astype(np.int32).reshape(graph.shape)
+    next_hop = np.array(next_hop, dtype=np.int32).reshape(graph.shape)
+    distance.setflags(write=False)
+    next_hop.setflags(write=False)
+
+    field = DistanceField(distance, next_hop)
+    field_cache[key] = field
+    if len(field_cache) > FIELD_CACHE_SIZE:
+        field_cache.popitem(last=False)
+    return field
+
+
+def maze_key(maze):
+    # Content hash of the cells, shape and exits; the start does not change a distance field.
+    # A graph also hashes its adjacency, since a contracted graph shares its maze's cells but
+    # not its edges.
+    if isinstance(maze, MazeGraph):
+        cells, shape, exits = maze.cells, maze.shape, maze.exits
+    else:
+        maze = as_maze(maze)
+        cells, shape = maze.grid, maze.shape
+        exits = tuple(row * shape[1] + col for row, col in maze.exits)
+    digest = hashlib.sha256(np.ascontiguousarray(cells, dtype=np.uint8).tobytes())
+    digest.update(repr((tuple(shape), tuple(exits))).encode())
+    if isinstance(maze, MazeGraph):
+        for array in (maze.indptr, maze.indices, maze.weights):
+            digest.update(np.ascontiguousarray(array, dtype=np.int64).tobytes())
+    return digest.hexdigest()
+
+
+def path_to_exit(maze, cell):
+    # Cheapest path from cell (row, col) to its nearest exit, read off the next-hop field.
+    # Returns None if no exit can be reached from cell. maze may be the DistanceField returned
+    # by distance_field, which makes each query O(path length); given a maze, every call first
+    # hashes it to find the cached field, which is O(cells).
+    field = maze if isinstance(maze, DistanceField) else distance_field(maze)
+    cols = field.distance.shape[1]
+    row, col = cell
+    if field.distance[row, col] < 0:
+        return None
+    next_hop = field.next_hop.ravel()
+    path = [(row, col)]
+    current = row * cols + col
+    while next_hop[current] >= 0:
+        current = int(next_hop[current])
+        path.append(divmod(current, cols))
+    return path
 
-        for neighbor in neighbors:
-            edge_cost = get_edge_cost(current, neighbor, maze)
-            new_cost = distances[current] + edge_cost
 
-            if neighbor not in distances or new_cost < distances[neighbor]:
+def bidirectional_dijkstra(maze, stats=None):
+    # Dijkstra from the start and, at the same time, from all exits as one multi-source search.
+    # The two searches meet in the middle, so each only explores about half the radius.
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    return bidirectional_search(graph, indptr, indices, weights, stats)
+
+
+def bidirectional_bfs(maze, stats=None):
+    # bidirectional_dijkstra with every step counted as 1: the path with the fewest cells
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    return bidirectional_search(graph, indptr, indices, [1] * len(indices), stats)
+
+
+def bidirectional_search(graph, indptr, indices, weights, stats):
+    # Both frontiers are heaps and the one holding fewer entries is advanced. mu is the best
+    # start-to-exit cost seen through any node reached from both sides, and it is final once
+    # the two frontier minima add up to at least mu. Edge costs are symmetric, so the backward
+    # search can reuse the forward adjacency.
+    infinity = float('inf')
+    forward = [infinity] * len(graph.cells)
+    backward = [infinity] * len(graph.cells)
+    forward_parent = [-1] * len(graph.cells)
+    backward_parent = [-1] * len(graph.cells)  # Next cell towards the nearest exit
+
+    forward[graph.start] = 0
+    forward_queue = [(0, graph.start)]
+    backward_queue = []
+    for end in graph.exits:
+        backward[end] = 0
+        backward_queue.append((0, end))
+    heapq.heapify(backward_queue)
+
+    mu = infinity
+    meet = -1
+    if forward[graph.start] + backward[graph.start] < mu:
+        mu, meet = 0, graph.start
+    expanded = 0
+
+    while forward_queue and backward_queue and forward_queue[0][0] + backward_queue[0][0] < mu:
+        if len(forward_queue) <= len(backward_queue):
+            queue, distances, other, parent = forward_queue, forward, backward, forward_parent
+        else:
+            queue, distances, other, parent = backward_queue, backward, forward, backward_parent
+
+        current_cost, current = heapq.heappop(queue)
+        if current_cost > distances[current]:
+            continue  # Stale entry
+        expanded += 1
+
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            new_cost = current_cost + weights[i]
+            if new_cost < distances[neighbor]:
                 distances[neighbor] = new_cost
-                priority_queue.put((new_cost, neighbor))
                 parent[neighbor] = current
+                heapq.heappush(queue, (new_cost, neighbor))
+            if distances[neighbor] + other[neighbor] < mu:
+                mu = distances[neighbor] + other[neighbor]
+                meet = neighbor
 
-    return None
+    record_stats(stats, expanded)
+    if meet == -1:
+        return None
 
+    path = reconstruct_flat_path(forward_parent, meet, graph)
+    current = meet
+    while backward_parent[current] != -1:
+        current = backward_parent[current]
+        path.append(divmod(current, graph.shape[1]))
+    return path
 
-def bfs(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
-    queue = Queue()
-    queue.put(start)
-    visited = set()
-    parent = {}
 
-    while not queue.empty():
-        current = queue.get()
+def jps(maze, stats=None, expand=True):
+    # Jump Point Search for 4-connected grids. Straight runs over plain cells (path, start, exits)
+    # are skipped in one jump and only cells with a forced neighbour become search nodes, so open
+    # regions are crossed without expanding every cell. Terrain cells (4/5) are treated as
+    # obstacles while jumping and expanded one step at a time, which keeps weighted costs optimal.
+    # Returns the unit-step path, or the jump points alone with expand=False.
+    maze = as_maze(maze)
+    rows, cols = maze.shape
+    width = cols + 2  # One wall cell of padding on every side, so no bounds checks are needed
+    padded = np.zeros((rows + 2, width), dtype=np.uint8)
+    padded[1:-1, 1:-1] = maze.grid
+    cells = padded.ravel().tolist()
+    plain = [cell in (1, 2, 3) for cell in cells]
+    goals = set((row + 1) * width + col + 1 for row, col in maze.exits)
+    goal_coordinates = [(row + 1, col + 1) for row, col in maze.exits]
+
+    def jump(current, direction):
+        # First jump point reached from current (the cell after the parent) going in direction
+        vertical = direction not in (1, -1)
+        side = (1, -1) if vertical else (width, -width)
+        while True:
+            if cells[current] == 0:
+                return -1
+            if current in goals or not plain[current]:
+                return current
+            for step in side:
+                neighbor = current + step
+                if cells[neighbor] != 0 and (not plain[neighbor] or not plain[neighbor - direction]):
+                    return current  # Forced neighbour, or terrain alongside
+            if vertical and (jump(current + 1, 1) != -1 or jump(current - 1, -1) != -1):
+                return current  # A horizontal jump point is reachable from here
+            current += direction
+
+    def step_cost(a, b):
+        if cells[a] == 4 or cells[b] == 4:  # Rough terrain
+            return 2
+        if cells[a] == 5 or cells[b] == 5:  # Water terrain
+            return 3
+        return 1
 
-        if current in end_positions:
-            return reconstruct_path(parent, current)
+    def segment_cost(a, b, direction, length):
+        # Everything strictly between two jump points is plain, so only the end steps can cost more
+        if length == 1:
+            return step_cost(a, b)
+        return length - 2 + step_cost(a, a + direction) + step_cost(b - direction, b)
 
-        visited.add(current)
+    def h(node):
+        row, col = divmod(node, width)
+        return min(abs(row - end_row) + abs(col - end_col) for end_row, end_col in goal_coordinates)
 
-        neighbors = get_neighbors(current, maze)
+    start = (maze.start[0] + 1) * width + maze.start[1] + 1
+    g_score = {start: 0}
+    parent = {start: -1}
+    came_from = {start: 0}  # Direction of the jump that reached each node
+    closed = set()
+    queue = [(h(start), h(start), start)]  # Ties on f go to the smaller h, as in a_star
+    expanded = 0
+
+    while queue:
+        current_cost, current_h, current = heapq.heappop(queue)
+        if current in closed:
+            continue
+        if current in goals:
+            break
+        closed.add(current)
+        expanded += 1
+
+        incoming = came_from[current]
+        for direction in (width, -width, 1, -1):
+            if direction == -incoming and plain[current]:
+                continue  # Going back over the jump that led here is never shorter
+            if cells[current + direction] == 0:
+                continue
+            successor = jump(current + direction, direction)
+            if successor == -1 or successor in closed:
+                continue
+            length = abs(successor - current) // abs(direction)
+            g = g_score[current] + segment_cost(current, successor, direction, length)
+            if g < g_score.get(successor, float('inf')):
+                g_score[successor] = g
+                parent[successor] = current
+                came_from[successor] = direction
+                successor_h = h(successor)
+                heapq.heappush(queue, (g + successor_h, successor_h, successor))
+    else:
+        record_stats(stats, expanded)
+        return None
 
-        for neighbor in neighbors:
-            edge_cost = get_edge_cost(current, neighbor, maze)
-            if neighbor not in visited:
-                queue.put(neighbor)
-                parent[neighbor] = current
+    record_stats(stats, expanded)
+    points = []
+    while current != -1:
+        points.append((current // width - 1, current % width - 1))
+        current = parent[current]
+    points.reverse()
+    return expand_jump_path(points) if expand else points
+
+
+def expand_jump_path(points):
+    # Fill in the straight runs between consecutive jump points with unit steps
+    path = [points[0]]
+    for (row1, col1), (row2, col2) in zip(points, points[1:]):
+        step_row, step_col = (row2 > row1) - (row2 < row1), (col2 > col1) - (col2 < col1)
+        row, col = row1, col1
+        while (row, col) != (row2, col2):
+            row, col = row + step_row, col + step_col
+            path.append((row, col))
+    return path
 
-    return None
 
+def record_stats(stats, expanded):
+    if stats is not None:
+        stats['expanded'] = expanded
 
-def dfs(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
-    stack = [start]
-    visited = set()
-    parent = {}
 
-    while stack:
-        current = stack.pop()
+def ucs(maze, stats=None, queue='heap'):
+    if queue == 'dial':
+        return dial(maze, stats)
+    if queue != 'heap':
+        raise ValueError("Unknown queue: " + str(queue) + ". Choose from heap, dial")
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    priority_queue = [(0, start)]
+    closed = [False] * len(graph.cells)
+    distances = [float('inf')] * len(graph.cells)
+    distances[start] = 0
+    parent = [-1] * len(graph.cells)
+    expanded = 0
+
+    while priority_queue:
+        current_cost, current = heapq.heappop(priority_queue)
+
+        if closed[current]:
+            continue  # Stale entry left behind by a later improvement (lazy deletion)
 
         if current in end_positions:
-            return reconstruct_path(parent, current)
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, current, graph)
 
-        visited.add(current)
+        closed[current] = True
+        expanded += 1
 
-        neighbors = get_neighbors(current, maze)
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            new_cost = distances[current] + weights[i]
 
-        for neighbor in neighbors:
-            edge_cost = get_edge_cost(current, neighbor, maze)
-            if neighbor not in visited:
-                stack.append(neighbor)
+            if new_cost < distances[neighbor]:
+                distances[neighbor] = new_cost
+                heapq.heappush(priority_queue, (new_cost, neighbor))
                 parent[neighbor] = current
 
+    record_stats(stats, expanded)
     return None
 
 
-def get_valid_neighbors(position, maze, visited):
-    x, y = position
+def bfs(maze, stats=None):
+    # Nodes are marked visited as they are enqueued, so every cell enters the frontier at most
+    # once and keeps the parent that discovered it first: O(V + E) time and O(V) memory.
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    queue = deque([start])
+    visited = [False] * len(graph.cells)
+    visited[start] = True
+    parent = [-1] * len(graph.cells)
+    expanded = 0
 
-    neighbors = []
-    directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+    while queue:
+        current = queue.popleft()
 
-    for dx, dy in directions:
-        nx, ny = x + dx, y + dy
-        if (
-                0 <= nx < maze.shape[0] and 0 <= ny < maze.shape[1] and maze[nx, ny] != 0
-                and (nx, ny) not in visited
-        ):
-            neighbors.append((nx, ny))
-
-    return neighbors
+        if current in end_positions:
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, current, graph)
+
+        expanded += 1
+        for neighbor in indices[indptr[current]:indptr[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                queue.append(neighbor)
+                parent[neighbor] = current
 
+    record_stats(stats, expanded)
+    return None
 
-def iddfs(maze):
-    start = find_start(maze)
-    end_positions = find_end(maze)
-    max_depth = maze.shape[0] * maze.shape[1]  # Maximum possible depth of the maze
 
-    for depth_limit in range(max_depth + 1):
-        visited = set()
-        path = dfs_recursive(start, end_positions, maze, depth_limit, visited)
-        if path is not None:
-            return path
+def dfs(maze, stats=None):
+    # Same enqueue-time marking as bfs, with a stack as the frontier
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    stack = [start]
+    visited = [False] * len(graph.cells)
+    visited[start] = True
+    parent = [-1] * len(graph.cells)
+    expanded = 0
 
-    return None
+    while stack:
+        current = stack.pop()
 
+        if current in end_positions:
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, current, graph)
 
-def dfs_recursive(current, end_positions, maze, depth_limit, visited):
-    if current in end_positions:
-        return [current]
+        expanded += 1
+        for neighbor in indices[indptr[current]:indptr[current + 1]]:
+            if not visited[neighbor]:
+                visited[neighbor] = True
+                stack.append(neighbor)
+                parent[neighbor] = current
 
-    if depth_limit == 0:
-        return None
+    record_stats(stats, expanded)
+    return None
 
-    visited.add(current)
 
-    neighbors = get_valid_neighbors(current, maze, visited)
+def iddfs(maze, depth_step=1, stats=None):
+    # Iterative deepening on an explicit stack. Each iteration raises the depth limit by depth_step
+    # and resumes from the nodes the previous one stopped at, instead of restarting from the start.
+    # depth[] keeps the shallowest depth each node was reached at (a node is only pushed again when
+    # found shallower) and parent[] rebuilds the path once at the end, without list copies.
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph_lists(graph)
+    start = graph.start
+    end_positions = set(graph.exits)
+    unreached = len(graph.cells) + 1
+    depth = [unreached] * len(graph.cells)
+    depth[start] = 0
+    parent = [-1] * len(graph.cells)
+    expanded = 0  # Summed over all iterations
+
+    frontier = [(start, 0)]
+    depth_limit = 0
+    while frontier:
+        depth_limit += depth_step
+        stack, frontier = frontier, []
+
+        while stack:
+            current, current_depth = stack.pop()
+            if current_depth != depth[current] or current in end_positions:
+                continue  # Superseded by a shallower visit, or an exit: nothing to expand
+            if current_depth >= depth_limit:
+                frontier.append((current, current_depth))  # Resume from here in the next iteration
+                continue
+
+            expanded += 1
+            for neighbor in indices[indptr[current]:indptr[current + 1]]:
+                if current_depth + 1 < depth[neighbor]:
+                    depth[neighbor] = current_depth + 1
+                    parent[neighbor] = current
+                    stack.append((neighbor, current_depth + 1))
+
+        reached = [end for end in graph.exits if depth[end] != unreached]
+        if reached:
+            record_stats(stats, expanded)
+            return reconstruct_flat_path(parent, min(reached, key=lambda end: depth[end]), graph)
+
+    record_stats(stats, expanded)
+    return None
 
-    for neighbor in neighbors:
-        path = dfs_recursive(neighbor, end_positions, maze, depth_limit - 1, visited)
-        if path is not None:
-            return [current] + path
 
-    return None
+def fill_dead_ends(maze):
+    # Open cells left after dead-end filling, as a flat boolean array. A cell with at most one open
+    # neighbour that is neither the start nor an exit cannot lie on a path between them, so it is
+    # removed, which can turn its neighbour into a dead end in the next round. Every round peels
+    # the whole frontier at once, and only the neighbours of the cells just removed are rechecked.
+    graph = compile_graph(maze)
+    rows, cols = graph.shape
+    kept = np.asarray(graph.cells) != 0
+    degree = np.diff(graph.indptr)
+    protected = np.zeros(rows * cols, dtype=bool)
+    protected[[graph.start, *graph.exits]] = True
+    neighbors = grid_neighbors(graph.shape)
+
+    frontier = np.flatnonzero(kept & (degree <= 1) & ~protected)
+    while frontier.size:
+        kept[frontier] = False
+        around = neighbors[frontier].ravel()
+        around = around[around >= 0]
+        around = around[kept[around]]
+        np.subtract.at(degree, around, 1)
+        around = np.unique(around)
+        frontier = around[(degree[around] <= 1) & ~protected[around]]
+    return kept
+
+
+def contract_maze(maze):
+    # Dead-end filling followed by corridor contraction. The remaining cells with other than two
+    # neighbours (plus the start and exits) become junctions, and every corridor of two-neighbour
+    # cells between two junctions becomes one edge weighted by the summed edge costs along it.
+    # The result is a MazeGraph over the same flat cell indices, so the heap, bucket and A*
+    # solvers run on it unchanged; corridors maps (junction, junction) to the cells in between,
+    # for expand_contracted_path. Only the cheapest corridor between two junctions is kept.
+    graph = compile_graph(maze)
+    kept = fill_dead_ends(graph)
+    indptr, indices, weights = graph_lists(graph)
+    keep = kept.tolist()
+    degree = np.bincount(np.repeat(np.arange(len(kept)), np.diff(graph.indptr))[kept[graph.indices]],
+                         minlength=len(kept))
+    junction = (kept & (degree != 2))
+    junction[[graph.start, *graph.exits]] = True
+    junction = junction.tolist()
+
+    corridors = {}
+    costs = {}
+    for node in np.flatnonzero(junction).tolist():
+        for i in range(indptr[node], indptr[node + 1]):
+            previous, current, cost = node, indices[i], weights[i]
+            if not keep[current]:
+                continue
+            cells = []
+            while not junction[current]:
+                cells.append(current)
+                for j in range(indptr[current], indptr[current + 1]):
+                    neighbor = indices[j]
+                    if neighbor != previous and keep[neighbor]:
+                        break
+                previous, current, cost = current, neighbor, cost + weights[j]
+            if current != node and cost < costs.get((node, current), float('inf')):
+                costs[node, current] = cost
+                corridors[node, current] = cells
+
+    edges = sorted(costs)
+    sources = np.array([a for a, b in edges], dtype=np.int64)
+    contracted_indptr = np.zeros(len(kept) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(sources, minlength=len(kept)), out=contracted_indptr[1:])
+    contracted = MazeGraph(contracted_indptr, np.array([b for a, b in edges], dtype=np.int32),
+                           np.array([costs[edge] for edge in edges], dtype=np.int32),
+                           graph.cells, graph.shape, graph.start, graph.exits)
+    return Contraction(contracted, corridors, kept.reshape(graph.shape))
+
+
+def expand_contracted_path(path, contraction):
+    # Junction path from a solver run on contraction.graph back to unit steps for display_maze
+    if path is None:
+        return None
+    rows, cols = contraction.graph.shape
+    nodes = [row * cols + col for row, col in path]
+    expanded = [path[0]]
+    for a, b in zip(nodes, nodes[1:]):
+        expanded.extend(divmod(cell, cols) for cell in contraction.corridors[a, b])
+        expanded.append(divmod(b, cols))
+    return expanded
+
+
+def solve_contracted(maze, solver=dijkstra, stats=None):
+    # Any solver that accepts a MazeGraph, run on the contracted junction graph; stats counts the
+    # junctions it expanded
+    contraction = contract_maze(maze)
+    return expand_contracted_path(solver(contraction.graph, stats=stats), contraction)
+
+
+# Solvers offered in the game menu, by display name. Each takes a maze and returns a list of
+# (row, col) positions from the start to an exit, or None.
+SOLVERS = {
+    'A*': a_star,
+    'BFS': bfs,
+    'DFS': dfs,
+    'UCS': ucs,
+    'Dijkstra': dijkstra,
+    'Dial': dial,
+    'IDDFS': iddfs,
+    'JPS': jps,
+    'Bidirectional': bidirectional_dijkstra,
+    'Contracted': solve_contracted,
+}
+
+
+def get_solver(name):
+    if name not in SOLVERS:
+        raise ValueError("Unknown algorithm: " + str(name) + ". Choose from " + ", ".join(SOLVERS))
+    return SOLVERS[name]
 
 
 def find_start(maze):
-    start_positions = np.argwhere(maze == 2)
-    if len(start_positions) == 0:
-        raise ValueError("Start position not found in the maze.")
-    return tuple(start_positions[0])
+    return as_maze(maze).start
 
 
 def find_end(maze):
-    end_positions = []
-    end_position_1 = np.argwhere(maze == 3.1)
-    end_position_2 = np.argwhere(maze == 3.2)
-    end_position_3 = np.argwhere(maze == 3.3)
-    end_positions.append(end_position_1[0])
-    end_positions.append(end_position_2[0])
-    end_positions.append(end_position_3[0])
-    if len(end_positions) == 0:
-        raise ValueError("End positions not found in the maze.")
-    return [tuple(position) for position in end_positions]
+    return list(as_maze(maze).exits)
 
 
 def get_neighbors(position, maze):
@@ -249,24 +789,28 @@ def get_edge_cost(position1, position2, maze):
 
 
 def heuristic(current, end_positions, maze):
+    # Manhattan distance to the nearest exit. Every step costs at least 1, so this never
+    # overestimates; terrain is left out because a penalty on it would (a_star uses heuristic_field).
     x1, y1 = current
-    min_distance = float('inf')
-    sorted_end_positions = sorted(end_positions, key=lambda pos: maze[pos[0], pos[1]])
+    return min(abs(x1 - x2) + abs(y1 - y2) for x2, y2 in end_positions)
 
-    for position in sorted_end_positions:
-        x2, y2 = position
-        distance = abs(x1 - x2) + abs(y1 - y2)
 
-        # Consider terrain difficulty
-        terrain_type = maze[x1, y1]
-        if terrain_type == 4:  # Rough terrain
-            distance += 3
-        elif terrain_type == 5:  # Water terrain
-            distance += 4
+def path_cost(path, maze):
+    # Total get_edge_cost along a path of (row, col) cells
+    maze = as_maze(maze)
+    return sum(get_edge_cost(path[i], path[i + 1], maze.grid) for i in range(len(path) - 1))
 
-        min_distance = min(min_distance, distance)
 
-    return min_distance
+def reconstruct_flat_path(parent, current, graph):
+    # reconstruct_path over a parent list of flat indices, returning (row, col) tuples
+    cols = graph.shape[1]
+    path = [divmod(current, cols)]
+    while parent[current] != -1:
+        current = parent[current]
+        path.append(divmod(current, cols))
+    path.reverse()
+
+    return path
 
 
 def reconstruct_path(parent, current):
@@ -281,6 +825,7 @@ def reconstruct_path(parent, current):
 
 def verify_path_algorithm(path, maze):
     # Check if the path is valid (from start to one of the end points)
+    maze = as_maze(maze)
     start = find_start(maze)
     end_positions = find_end(maze)
     if path[0] != start or path[-1] not in end_positions:
@@ -291,7 +836,7 @@ def verify_path_algorithm(path, maze):
         x2, y2 = path[i + 1]
         if abs(x1 - x2) + abs(y1 - y2) != 1:
             return False
-        if maze[x2, y2] == 0:  # Check if the path passes through a wall
+        if maze.grid[x2, y2] == 0:  # Check if the path passes through a wall
             return False
 
     return True
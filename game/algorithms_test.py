@@ -1,29 +1,257 @@
 import timeit
+import queue
 import numpy as np
 import sys
 
 import maze_generation
 from algorithms import a_star, bfs, dfs, dijkstra, ucs,iddfs
+from algorithms import compile_graph, get_neighbors, get_edge_cost, verify_path_algorithm
+from algorithms import heuristic_field, path_cost, bidirectional_dijkstra, bidirectional_bfs
+from algorithms import jps, dial, SOLVERS
+from algorithms import distance_field, path_to_exit
+from algorithms import fill_dead_ends, contract_maze, solve_contracted
+from maze import Maze
 
-def generate_maze():
-    maze = maze_generation.generate_maze(100, 100)
-    return maze
+def test_compile_graph_matches_neighbors():
+    maze = maze_generation.generate_maze(12, 9, 'kruskal', seed=4)
+    graph = compile_graph(maze)
+    cols = maze.shape[1]
+    for node in range(maze.size):
+        position = divmod(node, cols)
+        neighbors = [divmod(int(n), cols) for n in graph.indices[graph.indptr[node]:graph.indptr[node + 1]]]
+        costs = list(graph.weights[graph.indptr[node]:graph.indptr[node + 1]])
+        expected = get_neighbors(position, maze.grid) if maze.grid[position] != 0 else []
+        assert neighbors == expected
+        assert costs == [get_edge_cost(position, neighbor, maze.grid) for neighbor in expected]
 
+    # Solvers accept the compiled graph directly
+    for solver in (a_star, bfs, dfs, dijkstra, ucs):
+        assert solver(graph) == solver(maze)
+        assert verify_path_algorithm(solver(graph), maze)
 
-def test_algorithm_performance(algorithm):
-    setup_code = '''
-from __main__ import generate_maze, {algorithm}
-maze = generate_maze()
-    '''.format(algorithm=algorithm)
+def queue_class_search(maze, kind):
+    # Cost to the nearest exit the way a_star, ucs and bfs searched before the heapq / deque cores:
+    # queue.PriorityQueue ('a_star', 'ucs') or queue.Queue ('bfs'), with nothing to skip nodes
+    # that were already expanded. bfs counts steps.
+    graph = compile_graph(maze)
+    indptr, indices, weights = graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+    end_positions = set(graph.exits)
+    cost = [float('inf')] * len(graph.cells)
+    cost[graph.start] = 0
+    if kind == 'bfs':
+        fifo = queue.Queue()
+        fifo.put(graph.start)
+        visited = [False] * len(graph.cells)
+        while not fifo.empty():
+            current = fifo.get()
+            if current in end_positions:
+                return cost[current]
+            visited[current] = True
+            for neighbor in indices[indptr[current]:indptr[current + 1]]:
+                if not visited[neighbor]:
+                    cost[neighbor] = cost[current] + 1
+                    fifo.put(neighbor)
+        return None
 
-    test_code = '''
-{algorithm}(maze)
-    '''.format(algorithm=algorithm)
+    h = heuristic_field(graph).ravel().tolist() if kind == 'a_star' else [0] * len(graph.cells)
+    pq = queue.PriorityQueue()
+    pq.put((h[graph.start], graph.start))
+    while not pq.empty():
+        current_cost, current = pq.get()
+        if current in end_positions:
+            return cost[current]
+        for i in range(indptr[current], indptr[current + 1]):
+            neighbor = indices[i]
+            new_cost = cost[current] + weights[i]
+            if new_cost < cost[neighbor]:
+                cost[neighbor] = new_cost
+                pq.put((new_cost + h[neighbor], neighbor))
+    return None
 
-    execution_time = timeit.timeit(stmt=test_code, setup=setup_code, number=1)
-    print("{algorithm}: Execution time: {time:.6f} seconds".format(algorithm=algorithm, time=execution_time))
+def benchmark_queue_cores(sizes=(200, 400), repeat=5):
+    # The queue-class searches against the heapq / deque solvers on the same compiled mazes. The old
+    # bfs re-expands nodes exponentially once terrain opens loops, so it runs on the maze without terrain.
+    for size in sizes:
+        maze = maze_generation.generate_maze(size, size, 'kruskal', seed=size)
+        perfect = maze_generation.generate_maze(size, size, 'kruskal', seed=size, rough_density=0, water_density=0)
+        for kind, solver, maze in (('a_star', a_star, maze), ('ucs', ucs, maze), ('bfs', bfs, perfect)):
+            graph = compile_graph(maze)
+            cost = queue_class_search(graph, kind)
+            path = solver(graph)
+            assert cost == (len(path) - 1 if kind == 'bfs' else path_cost(path, maze))
+            slow_time = min(timeit.repeat(lambda: queue_class_search(graph, kind), number=1, repeat=repeat))
+            fast_time = min(timeit.repeat(lambda: solver(graph), number=1, repeat=repeat))
+            print("{size}x{size} {kind}: {slow_time:.3f}s -> {fast_time:.3f}s ({speedup:.1f}x)".format(
+                size=size, kind=kind, slow_time=slow_time, fast_time=fast_time, speedup=slow_time / fast_time))
+
+def test_bfs_dfs_on_open_grid():
+    # A fully open grid has a huge number of cycles; with pop-time marking the frontier explodes
+    grid = np.ones((80, 80), dtype=np.uint8)
+    maze = Maze(grid, (0, 0), [(79, 79), (0, 79), (79, 0)])
+    path = bfs(maze)
+    assert verify_path_algorithm(path, maze)
+    assert len(path) == 80  # Hop-optimal
+    path = dfs(maze)
+    assert verify_path_algorithm(path, maze)
+    assert len(set(path)) == len(path)
+
+def test_iddfs_is_hop_optimal_and_stack_safe():
+    for seed in range(5):
+        maze = maze_generation.generate_maze(40, 30, 'wilson', seed=seed)
+        for depth_step in (1, 7):
+            path = iddfs(maze, depth_step)
+            assert verify_path_algorithm(path, maze)
+            assert len(path) == len(bfs(maze))
+
+    # Paths thousands of cells long, far beyond the recursion limit
+    maze = maze_generation.generate_maze(150, 150, 'dfs', verify='union_find', seed=1)
+    assert len(iddfs(maze)) == len(bfs(maze))
+
+def reference_distances(maze):
+    # Cost from the start to every reachable cell, with the queue.PriorityQueue search the solvers
+    # were built on before the heapq cores
+    pq = queue.PriorityQueue()
+    pq.put((0, maze.start))
+    best = {maze.start: 0}
+    while not pq.empty():
+        cost, position = pq.get()
+        if cost > best[position]:
+            continue
+        for neighbor in get_neighbors(position, maze.grid):
+            new_cost = cost + get_edge_cost(position, neighbor, maze.grid)
+            if new_cost < best.get(neighbor, float('inf')):
+                best[neighbor] = new_cost
+                pq.put((new_cost, neighbor))
+    return best
+
+def test_heap_cores_settle_each_node_once():
+    rng = np.random.default_rng(8)
+    for seed in range(8):
+        maze = maze_generation.generate_maze(30, 20, 'kruskal', seed=seed, rough_density=0.2, water_density=0.2)
+        grid = maze.grid.copy()
+        grid[(grid == 0) & (rng.random(grid.shape) < 0.3)] = 1  # Open walls so many paths reach each cell
+        flat = Maze(np.where(grid >= 4, 1, grid).astype(np.uint8), maze.start, maze.exits)
+        maze = Maze(grid, maze.start, maze.exits)
+
+        # Settling a node twice would expand more nodes than lie within the optimal cost
+        for current, solvers in ((maze, (a_star, ucs, dijkstra)), (flat, (a_star, bfs))):
+            distances = reference_distances(current)
+            cost = min(distances[end] for end in current.exits if end in distances)
+            for solver in solvers:
+                stats = {}
+                assert path_cost(solver(current, stats=stats), current) == cost, solver.__name__
+                h = heuristic_field(current) if solver is a_star else np.zeros(current.shape)
+                within = sum(1 for cell, distance in distances.items() if distance + h[cell] <= cost)
+                assert stats['expanded'] <= within, solver.__name__
+
+def test_a_star_is_optimal_with_fewer_expansions():
+    for seed in range(10):
+        maze = maze_generation.generate_maze(30, 20, 'kruskal', seed=seed, rough_density=0.3, water_density=0.2)
+        dijkstra_stats, manhattan_stats, exact_stats = {}, {}, {}
+        cost = path_cost(dijkstra(maze, dijkstra_stats), maze)
+        assert path_cost(a_star(maze, stats=manhattan_stats), maze) == cost
+        assert path_cost(a_star(maze, 'exact', exact_stats), maze) == cost
+        assert exact_stats['expanded'] <= manhattan_stats['expanded'] <= dijkstra_stats['expanded']
+
+    # A precomputed field can be reused across calls
+    field = heuristic_field(maze)
+    assert field.shape == maze.shape and field[maze.exits[0]] == 0
+    assert path_cost(a_star(maze, field), maze) == cost
+
+    try:
+        a_star(maze, 'euclidean')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown heuristic fields must be rejected")
+
+def test_bidirectional_search_matches_dijkstra():
+    for seed in range(20):
+        generator = ['kruskal', 'wilson', 'division', 'prim'][seed % 4]
+        maze = maze_generation.generate_maze(30, 20, generator, seed=seed, rough_density=0.3, water_density=0.2)
+        path = bidirectional_dijkstra(maze)
+        assert verify_path_algorithm(path, maze)
+        assert path_cost(path, maze) == path_cost(dijkstra(maze), maze)
+        path = bidirectional_bfs(maze)
+        assert verify_path_algorithm(path, maze)
+        assert len(path) == len(bfs(maze))
+
+def test_jps_matches_dijkstra_on_open_grids():
+    for seed in range(20):
+        maze = maze_generation.generate_maze(25, 25, 'kruskal', seed=seed, rough_density=0.05, water_density=0.05)
+        grid = maze.grid.copy()
+        grid[grid == 0] = 1  # Remove every wall so the maze is one open region with scattered terrain
+        for open_maze in (maze, Maze(grid, maze.start, maze.exits)):
+            path = jps(open_maze)
+            assert verify_path_algorithm(path, open_maze)
+            assert path_cost(path, open_maze) == path_cost(dijkstra(open_maze), open_maze)
+            assert jps(open_maze, expand=False)[-1] == path[-1]
+
+    # On a large open grid with scattered terrain JPS must not expand the equal-f plateau
+    rng = np.random.default_rng(0)
+    grid = np.ones((200, 200), dtype=np.uint8)
+    grid[rng.random(grid.shape) < 0.02] = 4
+    grid[0, 0], grid[-1, -1] = 2, 3
+    open_maze = Maze(grid, (0, 0), [(199, 199)])
+    jps_stats, a_star_stats = {}, {}
+    assert path_cost(jps(open_maze, jps_stats), open_maze) == path_cost(a_star(open_maze, stats=a_star_stats), open_maze)
+    assert jps_stats['expanded'] < a_star_stats['expanded']
+
+def test_dial_matches_heap_dijkstra():
+    for seed in range(20):
+        generator = ['dfs', 'kruskal', 'wilson', 'division'][seed % 4]
+        maze = maze_generation.generate_maze(30, 20, generator, seed=seed, rough_density=0.3, water_density=0.3)
+        cost = path_cost(dijkstra(maze), maze)
+        for path in (dial(maze), dijkstra(maze, queue='dial'), ucs(maze, queue='dial')):
+            assert verify_path_algorithm(path, maze)
+            assert path_cost(path, maze) == cost
+
+def test_solver_registry_paths_are_valid():
+    maze = maze_generation.generate_maze(15, 10, 'prim', seed=2)
+    for name, solver in SOLVERS.items():
+        assert verify_path_algorithm(solver(maze), maze), name
+
+def test_distance_field_answers_every_cell():
+    maze = maze_generation.generate_maze(20, 15, 'wilson', seed=9, rough_density=0.2, water_density=0.2)
+    field = distance_field(maze)
+    assert field.distance.shape == maze.shape and field.distance.dtype == np.int32
+    assert distance_field(Maze(maze.grid.copy(), maze.start, maze.exits)) is field  # Cached by content
+    assert field.distance[maze.start] == path_cost(dijkstra(maze), maze)
+    for row, col in [(0, 0), (2, 4), (10, 10), (30, 40)]:
+        path = path_to_exit(field, (row, col))
+        assert path == path_to_exit(maze, (row, col))
+        assert path[-1] in maze.exits
+        assert path_cost(path, maze) == field.distance[row, col]
+    wall = tuple(np.argwhere(maze.grid == 0)[0])
+    assert field.distance[wall] == -1 and path_to_exit(field, wall) is None
+
+def test_contracted_graph_keeps_costs_and_shrinks_the_search():
+    for seed in range(12):
+        generator = ['dfs', 'kruskal', 'wilson', 'division'][seed % 4]
+        maze = maze_generation.generate_maze(25, 20, generator, seed=seed, rough_density=0.2, water_density=0.2)
+        cost = path_cost(dijkstra(maze), maze)
+        for solver in (dijkstra, dial, a_star, bidirectional_dijkstra):
+            path = solve_contracted(maze, solver)
+            assert verify_path_algorithm(path, maze)
+            assert path_cost(path, maze) == cost
+
+    # Without terrain a perfect maze fills down to the tree joining the start and the exits
+    maze = maze_generation.generate_maze(60, 60, 'kruskal', seed=5, rough_density=0, water_density=0)
+    kept = fill_dead_ends(maze)
+    assert kept.sum() == len(set(sum((bfs(Maze(maze.grid, maze.start, [end])) for end in maze.exits), [])))
+    full_stats, contracted_stats = {}, {}
+    dijkstra(maze, full_stats)
+    path = solve_contracted(maze, stats=contracted_stats)
+    assert path == bfs(maze)  # The only simple path in a perfect maze
+    assert contracted_stats['expanded'] * 10 < full_stats['expanded']
+    assert len(contract_maze(maze).corridors) <= 10
+
+    # A contracted graph has the maze's cells and exits but its own edges, so it gets its own field
+    maze = maze_generation.generate_maze(25, 20, 'kruskal', seed=1, rough_density=0.2, water_density=0.2)
+    path = solve_contracted(maze, lambda graph, stats=None: a_star(graph, 'exact', stats))
+    assert verify_path_algorithm(path, maze)
+    assert verify_path_algorithm(path_to_exit(maze, maze.start), maze)
+    assert path_cost(path_to_exit(maze, maze.start), maze) == path_cost(path, maze)
 
 if __name__ == "__main__":
-    algorithms = ['dijkstra', 'a_star', 'bfs', 'dfs','ucs','iddfs']
-    for algorithm in algorithms:
-        test_algorithm_performance(algorithm)
+    benchmark_queue_cores()
@@ -0,0 +1,149 @@
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from algorithms import get_solver, path_cost
+from maze import Maze
+from maze_generation import generate_maze
+
+FIELDS = ['generator', 'width', 'height', 'seed', 'algorithm', 'cost', 'length', 'expanded', 'seconds']
+
+
+def batch_solve(jobs, output, workers=None):
+    # Solve a list of (generator, size, seed, algorithm) jobs on a process pool. size is a width or
+    # a (width, height) pair and algorithm a name from algorithms.SOLVERS. Each maze is generated
+    # once, by a worker, straight into a shared-memory uint8 buffer that this process allocates;
+    # the solve jobs on that maze are submitted once it is ready and attach to the same buffer,
+    # so no grid is ever pickled. Results stream to output as they complete, as CSV if the file
+    # name ends in .csv and JSON lines otherwise, and are also returned.
+    groups = {}  # (generator, width, height, seed) -> algorithms, in job order
+    for generator, size, seed, algorithm in jobs:
+        get_solver(algorithm)  # Fail on unknown names before starting any work
+        width, height = (size, size) if np.isscalar(size) else size
+        groups.setdefault((generator, int(width), int(height), seed), []).append(algorithm)
+
+    workers = workers or os.cpu_count() or 1
+    window = 2 * workers  # Mazes held in shared memory at once
+    mazes = iter(groups.items())
+    shared = {}
+    remaining = {}
+    pending = {}
+    results = []
+
+    with open(output, 'w', newline='') as out, ProcessPoolExecutor(workers) as pool:
+        write = result_writer(out, output.endswith('.csv'))
+        try:
+            while True:
+                while len(shared) < window:
+                    key, algorithms = next(mazes, (None, None))
+                    if key is None:
+                        break
+                    generator, width, height, seed = key
+                    shared[key] = allocate((2 * height + 1) * (2 * width + 1))
+                    remaining[key] = len(algorithms)
+                    future = pool.submit(generate_shared, shared[key].name, generator, width, height, seed)
+                    pending[future] = key, None
+                if not pending:
+                    break
+
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    key, algorithm = pending.pop(future)
+                    if algorithm is None:
+                        # The maze is in shared memory now; hand every job on it to the pool
+                        shape, start, exits = future.result()
+                        for algorithm in groups[key]:
+                            future = pool.submit(solve_shared, shared[key].name, shape, start, exits, algorithm)
+                            pending[future] = key, algorithm
+                        continue
+                    result = dict(zip(FIELDS, key + (algorithm,)))
+                    result.update(future.result())
+                    write(result)
+                    results.append(result)
+                    remaining[key] -= 1
+                    if remaining[key] == 0:
+                        release(shared.pop(key))
+        finally:
+            for future in pending:
+                future.cancel()
+            for segment in shared.values():
+                release(segment)
+
+    return results
+
+
+def allocate(size):
+    return shared_memory.SharedMemory(create=True, size=max(size, 1))
+
+
+def release(segment):
+    segment.close()
+    segment.unlink()
+
+
+def generate_shared(name, generator, width, height, seed):
+    # Worker side: generate the maze into the buffer allocated by batch_solve
+    maze = generate_maze(width, height, generator, seed=seed)
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        np.ndarray(maze.shape, dtype=np.uint8, buffer=segment.buf)[:] = maze.grid
+    finally:
+        segment.close()
+    return maze.shape, maze.start, maze.exits
+
+
+def solve_shared(name, shape, start, exits, algorithm):
+    # Worker side: attach to the maze without copying it, solve, and detach again
+    segment = shared_memory.SharedMemory(name=name)
+    try:
+        return solve(Maze(np.ndarray(shape, dtype=np.uint8, buffer=segment.buf), start, exits), algorithm)
+    finally:
+        segment.close()
+
+
+def solve(maze, algorithm):
+    stats = {}
+    started = time.perf_counter()
+    path = get_solver(algorithm)(maze, stats=stats)
+    seconds = time.perf_counter() - started
+    return {
+        'cost': path_cost(path, maze) if path else None,
+        'length': len(path) if path else None,
+        'expanded': stats.get('expanded'),
+        'seconds': seconds,
+    }
+
+
+def result_writer(out, as_csv):
+    if as_csv:
+        writer = csv.DictWriter(out, fieldnames=FIELDS)
+        writer.writeheader()
+
+    def write(result):
+        if as_csv:
+            writer.writerow(result)
+        else:
+            out.write(json.dumps(result) + '\n')
+        out.flush()
+
+    return write
+
+
+if __name__ == "__main__":
+    # python batch.py [output] [workers]: every solver on a small sweep of generated mazes
+    output = sys.argv[1] if len(sys.argv) > 1 else 'batch_results.jsonl'
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    jobs = [(generator, size, seed, algorithm)
+            for generator in ('dfs', 'kruskal', 'wilson')
+            for size in (50, 100)
+            for seed in range(10)
+            for algorithm in ('A*', 'Dijkstra', 'Dial', 'BFS', 'JPS')]
+    started = time.perf_counter()
+    batch_solve(jobs, output, workers)
+    print(str(len(jobs)) + " jobs in " + format(time.perf_counter() - started, '.2f') + " s -> " + output)
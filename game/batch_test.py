@@ -0,0 +1,20 @@
+import csv
+
+import maze_generation
+from algorithms import dijkstra, path_cost
+from batch import batch_solve
+
+
+def test_batch_solve_streams_every_job(tmp_path):
+    jobs = [(generator, (15, 10), seed, algorithm)
+            for generator in ('kruskal', 'prim') for seed in range(3) for algorithm in ('Dijkstra', 'Dial', 'BFS')]
+    output = str(tmp_path / 'results.csv')
+    results = batch_solve(jobs, output, workers=2)
+    with open(output, newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert len(results) == len(rows) == len(jobs)
+    for result in results:
+        assert result['expanded'] > 0 and result['seconds'] >= 0
+        if result['algorithm'] != 'BFS':
+            maze = maze_generation.generate_maze(15, 10, result['generator'], seed=result['seed'])
+            assert result['cost'] == path_cost(dijkstra(maze), maze)
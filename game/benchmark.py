@@ -0,0 +1,130 @@
+import json
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+from algorithms import SOLVERS, path_cost
+from generators import GENERATORS
+from maze_generation import generate_maze
+
+# Full sweep: every generator and solver from 50 to 2000 cells per side. Takes hours in CPython.
+FULL = {
+    'sizes': (50, 100, 200, 500, 1000, 2000),
+    'generators': tuple(GENERATORS),
+    'densities': ((0.0, 0.0), (0.05, 0.05), (0.2, 0.2)),
+    'solvers': tuple(SOLVERS),
+    'seeds': (0, 1, 2),
+    'repeat': 5,
+}
+
+# Quick sweep for checking a change before committing it, a few minutes at most
+QUICK = {
+    'sizes': (50, 100, 200),
+    'generators': ('dfs', 'kruskal', 'wilson'),
+    'densities': ((0.05, 0.05),),
+    'solvers': tuple(SOLVERS),
+    'seeds': (0,),
+    'repeat': 5,
+}
+
+
+def run_benchmark(output, sizes, generators, densities, solvers, seeds, repeat=5, warmup=1):
+    # Times generate_maze for every (generator, size, density, seed) and every solver on the
+    # resulting maze. Each measurement runs warmup untimed calls, then repeat timed ones, and
+    # reports the median and 10th/90th percentiles in seconds. Peak memory comes from one extra
+    # call under tracemalloc, kept apart so tracing does not slow the timed runs. Records are
+    # written to output as JSON lines in sweep order with sorted keys, so two result files from
+    # the same sweep can be diffed or passed to compare_results.
+    records = []
+    with open(output, 'w') as out:
+        for generator in generators:
+            for size in sizes:
+                for rough_density, water_density in densities:
+                    for seed in seeds:
+                        config = {'generator': generator, 'size': size, 'rough_density': rough_density,
+                                  'water_density': water_density, 'seed': seed}
+
+                        def generate():
+                            return generate_maze(size, size, generator, verify='union_find', seed=seed,
+                                                 rough_density=rough_density, water_density=water_density)
+
+                        maze = generate()
+                        record = dict(config, kind='generate', name=generator)
+                        record.update(measure(generate, repeat, warmup))
+                        records.append(record)
+                        out.write(json.dumps(record, sort_keys=True) + '\n')
+
+                        for name in solvers:
+                            solver = SOLVERS[name]
+                            stats = {}
+                            path = solver(maze, stats=stats)
+                            record = dict(config, kind='solve', name=name,
+                                          cost=path_cost(path, maze) if path else None,
+                                          expanded=stats.get('expanded'))
+                            record.update(measure(lambda: solver(maze), repeat, warmup))
+                            records.append(record)
+                            out.write(json.dumps(record, sort_keys=True) + '\n')
+                        out.flush()
+    return records
+
+
+def measure(function, repeat, warmup):
+    for _ in range(warmup):
+        function()
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    p10, median, p90 = np.percentile(times, [10, 50, 90]).tolist()
+    return {'repeat': repeat, 'median': median, 'p10': p10, 'p90': p90, 'min': min(times), 'peak_bytes': peak}
+
+
+def record_key(record):
+    return tuple(record[field] for field in
+                 ('kind', 'name', 'generator', 'size', 'rough_density', 'water_density', 'seed'))
+
+
+def compare_results(baseline, current, tolerance=0.2):
+    # Measurements in the current results file whose median is more than tolerance slower than in
+    # the baseline file, as (record, baseline median, current median), slowest regressions first.
+    # A solver whose cost changes on the same maze is reported too, with infinite slowdown.
+    def load(path):
+        with open(path) as f:
+            return {record_key(record): record for record in map(json.loads, f)}
+
+    before, after = load(baseline), load(current)
+    regressions = []
+    for key, record in after.items():
+        if key not in before:
+            continue
+        old = before[key]
+        if record.get('cost') != old.get('cost'):
+            regressions.append((record, old['median'], float('inf')))
+        elif record['median'] > old['median'] * (1 + tolerance):
+            regressions.append((record, old['median'], record['median']))
+    regressions.sort(key=lambda regression: regression[2] / regression[1], reverse=True)
+    return regressions
+
+
+if __name__ == "__main__":
+    # python benchmark.py [quick|full] [output]        run a sweep
+    # python benchmark.py compare baseline current    list regressions between two result files
+    if len(sys.argv) > 1 and sys.argv[1] == 'compare':
+        for record, old, new in compare_results(sys.argv[2], sys.argv[3]):
+            print(" ".join(str(part) for part in record_key(record)) + ": " +
+                  format(old, '.4f') + " s -> " + format(new, '.4f') + " s")
+    else:
+        sweep = FULL if len(sys.argv) > 1 and sys.argv[1] == 'full' else QUICK
+        output = sys.argv[2] if len(sys.argv) > 2 else 'benchmark_results.jsonl'
+        started = time.perf_counter()
+        records = run_benchmark(output, **sweep)
+        print(str(len(records)) + " measurements in " + format(time.perf_counter() - started, '.1f') + " s -> " + output)
@@ -0,0 +1,19 @@
+import benchmark
+
+
+def test_benchmark_is_reproducible(tmp_path):
+    sweep = dict(sizes=(10, 20), generators=('dfs', 'kruskal'), densities=((0.1, 0.1),),
+                 solvers=('Dijkstra', 'BFS'), seeds=(0, 1), repeat=3, warmup=0)
+    first = benchmark.run_benchmark(str(tmp_path / 'first.jsonl'), **sweep)
+    second = benchmark.run_benchmark(str(tmp_path / 'second.jsonl'), **sweep)
+    assert len(first) == 2 * 2 * 2 * (1 + 2)
+    for a, b in zip(first, second):
+        assert benchmark.record_key(a) == benchmark.record_key(b)
+        assert a.get('cost') == b.get('cost') and a.get('expanded') == b.get('expanded')
+        assert a['p10'] <= a['median'] <= a['p90'] and a['peak_bytes'] > 0
+    regressions = benchmark.compare_results(str(tmp_path / 'first.jsonl'), str(tmp_path / 'second.jsonl'), 1e9)
+    assert regressions == []
+
+
+if __name__ == "__main__":
+    benchmark.run_benchmark('benchmark_results.jsonl', **benchmark.QUICK)
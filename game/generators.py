@@ -0,0 +1,290 @@
+import itertools
+import random
+from array import array
+import numpy as np
+
+# Every carver takes a zero-filled maze of shape (2 * height + 1, 2 * width + 1), the (x, y) start
+# point and a numpy.random.Generator, and carves a spanning tree over the even-index cells: the cell
+# at lattice position (r, c) lives at maze[2 * r, 2 * c] and the wall between two neighbouring
+# cells sits at maze[r1 + r2, c1 + c2]. generate_maze places the start, exits and terrain
+# afterwards, so every generator emits the same encoding (0 wall, 1 path, 2 start, 3 exits, 4/5 terrain).
+
+
+def carve_path(maze, x, y, rng=None):
+    # Randomized depth-first carve over the even-index cells, driven by an explicit stack so
+    # large mazes do not exhaust the interpreter or C stack. Each cell shuffles its directions
+    # when it is entered, exactly like the old recursive carver, so seeded runs are unchanged.
+    # With an rng (numpy.random.Generator) the shuffles come from one batched uint8 draw of
+    # indices into the 24 direction orders instead of the random module, one byte per cell.
+    rows, cols = maze.shape
+    carved = bytearray((maze != 0).astype(np.uint8).tobytes())  # Flat row-major mirror of the maze
+
+    if rng is None:
+        shuffles = None
+    else:
+        shuffles = iter(rng.integers(len(DIRECTION_ORDERS), size=(rows // 2 + 1) * (cols // 2 + 1), dtype=np.uint8))
+
+    def directions():
+        return iter(shuffled_directions() if shuffles is None else DIRECTION_ORDERS[next(shuffles)])
+
+    carved[y * cols + x] = 1
+    stack = [(x, y, directions())]
+
+    while stack:
+        x, y, cell_directions = stack[-1]
+        for dx, dy in cell_directions:
+            next_x, next_y = x + 2 * dx, y + 2 * dy
+            if 0 <= next_x < cols and 0 <= next_y < rows and not carved[next_y * cols + next_x]:
+                carved[(y + dy) * cols + x + dx] = 1  # Carve the path by removing the wall
+                carved[next_y * cols + next_x] = 1
+                stack.append((next_x, next_y, directions()))
+                break
+        else:
+            stack.pop()
+
+    carved = np.frombuffer(carved, dtype=np.uint8).reshape(rows, cols).astype(bool)
+    maze[carved & (maze == 0)] = 1
+
+
+DIRECTIONS = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+DIRECTION_ORDERS = tuple(itertools.permutations(DIRECTIONS))
+
+
+def shuffled_directions():
+    directions = list(DIRECTIONS)
+    random.shuffle(directions)
+    return directions
+
+
+def carve_dfs(maze, start, rng):
+    # Recursive backtracker: long winding corridors, O(cells) time, stack up to O(cells)
+    carve_path(maze, start[0], start[1], rng)
+
+
+def carve_kruskal(maze, start, rng):
+    # Randomized Kruskal: accept the lattice walls in random order through a union-find
+    rows, cols = lattice_shape(maze)
+    u, v = lattice_edges(rows, cols)
+    order = rng.permutation(len(u))
+    u, v = u[order], v[order]
+
+    parent = list(range(rows * cols))
+    accepted = []
+    for i, (a, b) in enumerate(zip(u.tolist(), v.tolist())):
+        while parent[a] != a:
+            parent[a] = parent[parent[a]]
+            a = parent[a]
+        while parent[b] != b:
+            parent[b] = parent[parent[b]]
+            b = parent[b]
+        if a != b:
+            parent[b] = a
+            accepted.append(i)
+
+    open_passages(maze, cols, u[accepted], v[accepted])
+
+
+def carve_prim(maze, start, rng):
+    # Randomized Prim: grow the tree from the start, joining a random frontier cell each step
+    rows, cols = lattice_shape(maze)
+    cells = rows * cols
+    in_tree = bytearray(cells)
+    on_frontier = bytearray(cells)
+    frontier = []
+    draws = random_pairs(rng)  # One pick of frontier cell and tree neighbour per step
+    u, v = array('q'), array('q')  # Tree edges, eight bytes each
+
+    def add(cell):
+        in_tree[cell] = 1
+        r, c = divmod(cell, cols)
+        for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1)):
+            if 0 <= nr < rows and 0 <= nc < cols:
+                neighbor = nr * cols + nc
+                if not in_tree[neighbor] and not on_frontier[neighbor]:
+                    on_frontier[neighbor] = 1
+                    frontier.append(neighbor)
+
+    add((start[1] // 2) * cols + start[0] // 2)
+    while frontier:
+        pick_cell, pick_neighbor = next(draws)
+        i = int(pick_cell * len(frontier))
+        frontier[i], frontier[-1] = frontier[-1], frontier[i]
+        cell = frontier.pop()
+
+        r, c = divmod(cell, cols)
+        tree_neighbors = [nr * cols + nc for nr, nc in ((r + 1, c), (r - 1, c), (r, c + 1), (r, c - 1))
+                          if 0 <= nr < rows and 0 <= nc < cols and in_tree[nr * cols + nc]]
+        u.append(tree_neighbors[int(pick_neighbor * len(tree_neighbors))])
+        v.append(cell)
+        add(cell)
+
+    open_passages(maze, cols, np.array(u, dtype=np.int64), np.array(v, dtype=np.int64))
+
+
+def carve_wilson(maze, start, rng):
+    # Wilson's algorithm: loop-erased random walks, a uniformly random spanning tree
+    rows, cols = lattice_shape(maze)
+    cells = rows * cols
+    in_tree = bytearray(cells)
+    next_cell = [0] * cells  # Last exit taken from each cell on the current walk (erases loops)
+    moves = (cols, -cols, 1, -1)
+    u, v = [], []
+
+    directions = []
+    position = 0
+
+    in_tree[(start[1] // 2) * cols + start[0] // 2] = 1
+    for walk_start in rng.permutation(cells).tolist():
+        if in_tree[walk_start]:
+            continue
+
+        cell = walk_start
+        while not in_tree[cell]:
+            r, c = divmod(cell, cols)
+            while True:
+                if position == len(directions):
+                    directions = rng.integers(0, 4, size=max(cells, 1024)).tolist()
+                    position = 0
+                d = directions[position]
+                position += 1
+                if (d == 0 and r + 1 < rows) or (d == 1 and r > 0) or (d == 2 and c + 1 < cols) or (d == 3 and c > 0):
+                    break
+            next_cell[cell] = cell + moves[d]
+            cell = next_cell[cell]
+
+        cell = walk_start
+        while not in_tree[cell]:
+            in_tree[cell] = 1
+            u.append(cell)
+            v.append(next_cell[cell])
+            cell = next_cell[cell]
+
+    open_passages(maze, cols, np.array(u, dtype=np.int64), np.array(v, dtype=np.int64))
+
+
+def carve_eller(maze, start, rng):
+    # Eller's algorithm: one row at a time with O(width) state
+    rows, cols = lattice_shape(maze)
+    for r, (right, down) in enumerate(eller_rows(rows, cols, rng)):
+        maze[2 * r, 1::2][right] = 1
+        if r < rows - 1:
+            maze[2 * r + 1, ::2][down] = 1
+    maze[::2, ::2] = 1
+
+
+def eller_rows(rows, cols, rng):
+    # Yields, for every lattice row, which walls to the right and which walls below are opened.
+    # Set membership only ever covers the current row, so memory stays O(cols).
+    labels = np.arange(cols)
+    for r in range(rows):
+        last = r == rows - 1
+        labels = np.unique(labels, return_inverse=True)[1].ravel()
+        parent = list(range(cols))
+
+        def find(a):
+            while parent[a] != a:
+                parent[a] = parent[parent[a]]
+                a = parent[a]
+            return a
+
+        right = np.zeros(cols - 1, dtype=bool)
+        join = (rng.random(cols - 1) < 0.5).tolist()
+        label_list = labels.tolist()
+        for c in range(cols - 1):
+            if last or join[c]:
+                a, b = find(label_list[c]), find(label_list[c + 1])
+                if a != b:
+                    parent[b] = a
+                    right[c] = True
+        roots = np.array([find(label) for label in label_list], dtype=np.int64)
+
+        down = np.zeros(cols, dtype=bool)
+        if not last:
+            # Random drops, then make sure every set keeps at least one cell going down
+            down = rng.random(cols) < 0.5
+            has_down = np.zeros(cols, dtype=bool)
+            has_down[roots[down]] = True
+            order = rng.permutation(cols)
+            _, first = np.unique(roots[order], return_index=True)
+            chosen = order[first]
+            down[chosen[~has_down[roots[chosen]]]] = True
+        yield right, down
+
+        labels = np.where(down, roots, cols + np.arange(cols))
+
+
+def carve_division(maze, start, rng):
+    # Recursive division: open everything, then wall off regions with a single gap in each wall.
+    # Each wall is one slice assignment, and regions are kept on an explicit stack.
+    rows, cols = lattice_shape(maze)
+    maze[::2, :] = 1
+    maze[:, ::2] = 1
+
+    draws = random_pairs(rng)  # One pick of wall and gap per split
+    regions = [(0, 0, rows, cols)]  # Lattice rows [r0, r1) and columns [c0, c1)
+    while regions:
+        r0, c0, r1, c1 = regions.pop()
+        height, width = r1 - r0, c1 - c0
+        if height < 2 or width < 2:
+            continue
+        pick_wall, pick_gap = next(draws)
+
+        if height > width or (height == width and pick_wall < 0.5):
+            # Horizontal wall below lattice row k, gap at one column
+            k = r0 + int(pick_wall * (height - 1))
+            gap = c0 + int(pick_gap * width)
+            maze[2 * k + 1, 2 * c0:2 * c1 - 1:2] = 0
+            maze[2 * k + 1, 2 * gap] = 1
+            regions.append((r0, c0, k + 1, c1))
+            regions.append((k + 1, c0, r1, c1))
+        else:
+            # Vertical wall right of lattice column k, gap at one row
+            k = c0 + int(pick_wall * (width - 1))
+            gap = r0 + int(pick_gap * height)
+            maze[2 * r0:2 * r1 - 1:2, 2 * k + 1] = 0
+            maze[2 * gap, 2 * k + 1] = 1
+            regions.append((r0, c0, r1, k + 1))
+            regions.append((r0, k + 1, r1, c1))
+
+
+def random_pairs(rng, chunk=4096):
+    # Endless uniform (x, y) pairs, drawn from rng a fixed-size chunk at a time so the draws never
+    # grow with the maze
+    while True:
+        yield from rng.random((chunk, 2)).tolist()
+
+
+def lattice_shape(maze):
+    return maze.shape[0] // 2 + 1, maze.shape[1] // 2 + 1
+
+
+def lattice_edges(rows, cols):
+    # Flat lattice indices of every pair of horizontally or vertically neighbouring cells
+    index = np.arange(rows * cols).reshape(rows, cols)
+    u = np.concatenate((index[:, :-1].ravel(), index[:-1, :].ravel()))
+    v = np.concatenate((index[:, 1:].ravel(), index[1:, :].ravel()))
+    return u, v
+
+
+def open_passages(maze, cols, u, v):
+    # Open every lattice cell and the walls between the given pairs of flat lattice indices
+    maze[::2, ::2] = 1
+    ur, uc = np.divmod(u, cols)
+    vr, vc = np.divmod(v, cols)
+    maze[ur + vr, uc + vc] = 1
+
+
+GENERATORS = {
+    'dfs': carve_dfs,
+    'kruskal': carve_kruskal,
+    'prim': carve_prim,
+    'wilson': carve_wilson,
+    'eller': carve_eller,
+    'division': carve_division,
+}
+
+
+def get_generator(name):
+    if name not in GENERATORS:
+        raise ValueError("Unknown maze generator: " + str(name) + ". Choose from " + ", ".join(GENERATORS))
+    return GENERATORS[name]
@@ -0,0 +1,95 @@
+import numpy as np
+
+# Cell codes of the compact uint8 grid
+WALL = 0
+PATH = 1
+START = 2
+EXIT = 3
+ROUGH = 4  # Rough terrain
+WATER = 5  # Water terrain
+
+# Legacy float grids tell the exits apart by value; exits[i] of a Maze is the cell that held LEGACY_EXITS[i]
+LEGACY_EXITS = (3.1, 3.2, 3.3)
+
+
+class Maze:
+    def __init__(self, grid, start, exits):
+        self.grid = np.asarray(grid, dtype=np.uint8)  # One byte per cell, not copied if already uint8
+        self.start = (int(start[0]), int(start[1]))  # (row, col)
+        self.exits = tuple((int(row), int(col)) for row, col in exits)  # (row, col), ordered as LEGACY_EXITS
+
+    @classmethod
+    def from_legacy(cls, maze):
+        # Adapter for the float arrays with 2 for the start and 3.1/3.2/3.3 for the exits
+        maze = np.asarray(maze)
+        start_positions = np.argwhere(maze == START)
+        if len(start_positions) == 0:
+            raise ValueError("Start position not found in the maze.")
+
+        exits = [np.argwhere(maze == code) for code in LEGACY_EXITS]
+        exits = [positions[0] for positions in exits if len(positions) > 0]
+        if len(exits) == 0:
+            exits = list(np.argwhere(maze == EXIT))  # Plain integer grids mark their exits with 3
+        if len(exits) == 0:
+            raise ValueError("End positions not found in the maze.")
+
+        grid = maze if np.issubdtype(maze.dtype, np.integer) else np.floor(maze)  # Integer grids need no copy
+        return cls(grid, start_positions[0], exits)
+
+    def to_legacy(self):
+        maze = self.grid.astype(float)
+        for code, (row, col) in zip(LEGACY_EXITS, self.exits):
+            maze[row, col] = code
+        return maze
+
+    @property
+    def shape(self):
+        return self.grid.shape
+
+    @property
+    def size(self):
+        return self.grid.size
+
+    def __getitem__(self, index):
+        return self.grid[index]
+
+    def __setitem__(self, index, value):
+        self.grid[index] = value
+
+    def __array__(self, dtype=None, copy=None):
+        # np.array(maze) copies, np.asarray(maze) shares the grid, as for an ndarray
+        if copy:
+            return np.array(self.grid, dtype=dtype)
+        if dtype is None or np.dtype(dtype) == self.grid.dtype:
+            return self.grid
+        if copy is False:
+            raise ValueError("Converting the maze grid to " + str(np.dtype(dtype)) + " needs a copy")
+        return self.grid.astype(dtype)
+
+    # Comparisons act on the grid like the legacy arrays, so maze == 0 is a mask and not False
+    def __eq__(self, other):
+        return self.grid == other
+
+    def __ne__(self, other):
+        return self.grid != other
+
+    def __lt__(self, other):
+        return self.grid < other
+
+    def __le__(self, other):
+        return self.grid <= other
+
+    def __gt__(self, other):
+        return self.grid > other
+
+    def __ge__(self, other):
+        return self.grid >= other
+
+    def __repr__(self):
+        return "Maze(start={}, exits={})\n{}".format(self.start, self.exits, self.grid)
+
+
+def as_maze(maze):
+    if isinstance(maze, Maze):
+        return maze
+    return Maze.from_legacy(maze)
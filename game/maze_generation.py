@@ -1,90 +1,219 @@
+import json
+import os
 import numpy as np
-import sys
 import random
 import matplotlib.pyplot as plt
 import algorithms
+from generators import DIRECTIONS, carve_path, eller_rows, get_generator
+from maze import Maze, as_maze, START, EXIT, ROUGH, WATER
 from Adventurer import Adventurer
 
-sys.setrecursionlimit(10 ** 6)  # Increase the recursion limit
-
 # Global variables
 global game_finished  # Global variable to track game status
 game_finished = False
 
 
-def generate_maze(width, height):
-    maze = np.zeros((2 * height + 1, 2 * width + 1), dtype=float)
-
-    def carve_path(x, y):
-        maze[y, x] = 1
-
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            next_x, next_y = x + 2 * dx, y + 2 * dy
-            if 0 <= next_x < 2 * width + 1 and 0 <= next_y < 2 * height + 1 and maze[next_y, next_x] == 0:
-                maze[y + dy, x + dx] = 1
-                maze[y + dy // 2, x + dx // 2] = 1  # Carve the path by removing the wall
-                carve_path(next_x, next_y)
-
-    def generate_paths(start_x, start_y, end_x, end_y):
-        maze[start_y, start_x] = 1
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        random.shuffle(directions)
-
-        for dx, dy in directions:
-            next_x, next_y = start_x + 2 * dx, start_y + 2 * dy
-            if 0 <= next_x < 2 * width + 1 and 0 <= next_y < 2 * height + 1 and maze[next_y, next_x] == 0:
-                maze[start_y + dy, start_x + dx] = 1
-                maze[start_y + dy // 2, start_x + dx // 2] = 1  # Carve the path by removing the wall
-                generate_paths(next_x, next_y, end_x, end_y)
-
-    # Generate random start point on the left wall of the maze
-    start_x, start_y = 0, random.randint(1, height) * 2
-    start_point = (start_x, start_y)
-
-    # Generate end point on the upper wall of the maze
-    end_x, end_y = random.randint(1, width) * 2, 0
-    end_point_upper = (end_x, end_y)
-
-    # Generate end point on the outer wall of the maze
-    end_x, end_y = random.randint(1, width) * 2, height * 2
-    end_point_outer = (end_x, end_y)
-
-    # Generate end point of the right wall of the maze
-    end_x, end_y = 2 * width, random.randint(1, height) * 2
-    end_point_left = (end_x, end_y)
+def generate_maze(width, height, algorithm='dfs', verify='dfs', rough_density=0.05, water_density=0.05,
+                  seed=None):
+    # algorithm picks a carver from generators.GENERATORS ('dfs', 'kruskal', 'prim', 'wilson',
+    # 'eller', 'division'). Anything other than 'dfs' is always checked with union-find.
+    # verify='dfs' keeps the original carve-and-recheck loop so seeded mazes stay reproducible.
+    # verify='union_find' carves once and checks the start and all three exits with a single
+    # union-find pass, so generation time no longer depends on retries.
+    # seed (an int or numpy.random.Generator) makes the maze reproducible: endpoints, carving,
+    # verification and the vectorized add_terrain all draw from it instead of the random module.
+    # Returns a Maze; Maze.to_legacy() gives back the old float grid with 3.1/3.2/3.3 exits.
+    if verify not in ('dfs', 'union_find'):
+        raise ValueError("Unknown verify mode: " + str(verify))
+    carve = get_generator(algorithm)
+    if algorithm != 'dfs':
+        verify = 'union_find'
+    rng = np.random.default_rng(seed)
+    legacy_rng = None if seed is None else rng  # None keeps the random module for unseeded mazes
+
+    maze = np.zeros((2 * height + 1, 2 * width + 1), dtype=np.uint8)
+
+    if seed is not None:
+        (start_y, start_x), ends = random_endpoints(width, height, rng)
+        start_point = (start_x, start_y)
+        end_point_outer, end_point_left, end_point_upper = [(end_x, end_y) for end_y, end_x in ends]
+    else:
+        # Generate random start point on the left wall of the maze
+        start_x, start_y = 0, random.randint(1, height) * 2
+        start_point = (start_x, start_y)
+
+        # Generate end point on the upper wall of the maze
+        end_x, end_y = random.randint(1, width) * 2, 0
+        end_point_upper = (end_x, end_y)
+
+        # Generate end point on the outer wall of the maze
+        end_x, end_y = random.randint(1, width) * 2, height * 2
+        end_point_outer = (end_x, end_y)
+
+        # Generate end point of the right wall of the maze
+        end_x, end_y = 2 * width, random.randint(1, height) * 2
+        end_point_left = (end_x, end_y)
+
+    if verify == 'union_find':
+        # The carver visits every even-index cell, so the start and all exits lie on its spanning tree
+        carve(maze, start_point, rng)
+        if not is_connected(maze, start_point, [end_point_upper, end_point_outer, end_point_left]):
+            raise RuntimeError("Generated maze does not connect the start to every exit.")
 
     # Ensure that both end points are reachable from the start point
-    while not verify_path(maze, start_point, end_point_upper) or not verify_path(maze, start_point, end_point_outer):
-        maze = np.zeros((2 * height + 1, 2 * width + 1), dtype=float)
-        generate_paths(start_point[0], start_point[1], end_point_upper[0], end_point_upper[1])
-        generate_paths(start_point[0], start_point[1], end_point_outer[0], end_point_outer[1])
-        generate_paths(start_point[0], start_point[1], end_point_left[0], end_point_left[1])
-
-    maze[start_point[1], start_point[0]] = 2  # Set the start point
-    maze[end_point_upper[1], end_point_upper[0]] = 3.3  # Set the upper exit point
-    maze[end_point_outer[1], end_point_outer[0]] = 3.1  # Set the outer exit point
-    maze[end_point_left[1], end_point_left[0]] = 3.2  # Set the left exit point
+    while verify == 'dfs' and (not verify_path(maze, start_point, end_point_upper, legacy_rng)
+                              or not verify_path(maze, start_point, end_point_outer, legacy_rng)):
+        maze = np.zeros((2 * height + 1, 2 * width + 1), dtype=np.uint8)
+        carve_path(maze, start_point[0], start_point[1], legacy_rng)
+        carve_path(maze, start_point[0], start_point[1], legacy_rng)
+        carve_path(maze, start_point[0], start_point[1], legacy_rng)
+
+    maze[start_point[1], start_point[0]] = START  # Set the start point
+    exits = [end_point_outer, end_point_left, end_point_upper]  # Legacy exit codes 3.1, 3.2 and 3.3
+    for end_x, end_y in exits:
+        maze[end_y, end_x] = EXIT
+    maze = Maze(maze, (start_point[1], start_point[0]), [(end_y, end_x) for end_x, end_y in exits])
+
+    if seed is not None:
+        add_terrain(maze.grid, rng, rough_density, water_density)
+        return maze
 
     # Add rough terrain
     for y in range(1, 2 * height, 2):
         for x in range(1, 2 * width, 2):
-            if random.random() < 0.05:  # Adjust the probability as desired
-                maze[y, x] = 4  # Rough terrain
+            if random.random() < rough_density:
+                maze[y, x] = ROUGH  # Rough terrain
 
     # Add water
     for y in range(1, 2 * height, 2):
         for x in range(1, 2 * width, 2):
-            if random.random() < 0.05:  # Adjust the probability as desired
-                maze[y, x] = 5  # Water
+            if random.random() < water_density:
+                maze[y, x] = WATER  # Water
+    return maze
+
+
+def stream_maze(width, height, seed=None, rough_density=0.05, water_density=0.05):
+    # Eller's algorithm one maze row at a time: yields the uint8 rows of the same kind of grid
+    # generate_maze builds (start on the left wall, exits on the outer, right and upper walls,
+    # terrain on the odd-index cells) while only ever holding O(width) state.
+    rng = np.random.default_rng(seed)
+    start, exits = random_endpoints(width, height, rng)
+    return maze_rows(width, height, start, exits, rng, rough_density, water_density)
+
+
+def random_endpoints(width, height, rng):
+    # (row, col) of the start and of the exits, in Maze.exits order (outer, right, upper)
+    start_y = int(rng.integers(1, height + 1)) * 2
+    upper_x = int(rng.integers(1, width + 1)) * 2
+    outer_x = int(rng.integers(1, width + 1)) * 2
+    right_y = int(rng.integers(1, height + 1)) * 2
+    return (start_y, 0), [(2 * height, outer_x), (right_y, 2 * width), (0, upper_x)]
+
+
+def maze_rows(width, height, start, exits, rng, rough_density, water_density):
+    for r, (right, down) in enumerate(eller_rows(height + 1, width + 1, rng)):
+        y = 2 * r
+        row = np.ones(2 * width + 1, dtype=np.uint8)
+        row[1::2] = right
+        for end_y, end_x in exits:
+            if end_y == y:
+                row[end_x] = EXIT
+        if start[0] == y:
+            row[start[1]] = START
+        yield row
+
+        if r < height:
+            row = np.zeros(2 * width + 1, dtype=np.uint8)
+            row[::2] = down
+            draws = rng.random((2, width))
+            cells = row[1::2]
+            cells[draws[0] < rough_density] = ROUGH  # Rough terrain
+            cells[draws[1] < water_density] = WATER  # Water
+            yield row
+
+
+def generate_maze_file(path, width, height, seed=None, rough_density=0.05, water_density=0.05):
+    # Writes stream_maze straight into a memory-mapped uint8 .npy file, so mazes far larger than
+    # RAM can be produced. The start and exits go to a small JSON file next to it (path + '.json')
+    # so load_maze_file can reopen the maze without scanning or copying the grid. Returns a Maze
+    # over the memmap.
+    rng = np.random.default_rng(seed)
+    start, exits = random_endpoints(width, height, rng)
+    with open(endpoints_path(path), 'w') as f:
+        json.dump({'start': list(start), 'exits': [list(end) for end in exits]}, f)
+    maze = np.lib.format.open_memmap(path, mode='w+', dtype=np.uint8, shape=(2 * height + 1, 2 * width + 1))
+    for y, row in enumerate(maze_rows(width, height, start, exits, rng, rough_density, water_density)):
+        maze[y] = row
+        if y % 4096 == 4095:
+            maze.flush()  # Hand finished rows back to the OS instead of letting dirty pages pile up
+    maze.flush()
+    return Maze(maze, start, exits)
+
+
+def load_maze_file(path, mode='r'):
+    # Maze over a memory map of a file written by generate_maze_file. Without the endpoints file
+    # the start and exits are found by scanning the grid, which reads the whole file.
+    grid = np.load(path, mmap_mode=mode)
+    try:
+        with open(endpoints_path(path)) as f:
+            endpoints = json.load(f)
+    except FileNotFoundError:
+        return as_maze(grid)
+    return Maze(grid, endpoints['start'], endpoints['exits'])
+
+
+def endpoints_path(path):
+    return os.fspath(path) + '.json'
+
+
+def add_terrain(maze, rng, rough_density=0.05, water_density=0.05):
+    # Same placement as the per-cell loops: rough terrain on the odd-index cells, then water on top
+    cells = maze[1::2, 1::2]  # View, so the masks write straight into the maze
+    draws = rng.random((2,) + cells.shape)
+    cells[draws[0] < rough_density] = ROUGH  # Rough terrain
+    cells[draws[1] < water_density] = WATER  # Water
     return maze
 
 
-def verify_path(maze, start, end):
+def is_connected(maze, start, ends):
+    # Union-find over the even-index cells, joined wherever the wall between two of them is open.
+    # Unions are applied to all edges at once (hook every root onto the smallest neighbouring root,
+    # then compress with pointer jumping) so the check stays a handful of array passes.
+    cells = maze[::2, ::2] != 0
+    rows, cols = cells.shape
+    index = np.arange(rows * cols).reshape(rows, cols)
+
+    open_right = cells[:, :-1] & cells[:, 1:] & (maze[::2, 1::2] != 0)
+    open_down = cells[:-1, :] & cells[1:, :] & (maze[1::2, ::2] != 0)
+    u = np.concatenate((index[:, :-1][open_right], index[:-1, :][open_down]))
+    v = np.concatenate((index[:, 1:][open_right], index[1:, :][open_down]))
+
+    parent = np.arange(rows * cols)
+    while True:
+        root_u, root_v = parent[u], parent[v]
+        differ = root_u != root_v
+        if not differ.any():
+            break
+        np.minimum.at(parent, np.maximum(root_u, root_v)[differ], np.minimum(root_u, root_v)[differ])
+        while True:
+            grandparent = parent[parent]
+            if (grandparent == parent).all():
+                break
+            parent = grandparent
+
+    def root(point):
+        x, y = point
+        return parent[index[y // 2, x // 2]]
+
+    return all(root(end) == root(start) for end in ends)
+
+
+def verify_path(maze, start, end, rng=None):
+    # rng (a numpy.random.Generator) replaces the random module for the direction shuffles,
+    # drawn as batches of permutations rather than one shuffle call per visited cell
     stack = [start]
     visited = set()
+    orders = []
 
     while stack:
         x, y = stack.pop()
@@ -93,8 +222,13 @@ def verify_path(maze, start, end):
         if (x, y) == end:
             return True
 
-        directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
-        random.shuffle(directions)
+        if rng is None:
+            directions = [(1, 0), (-1, 0), (0, 1), (0, -1)]
+            random.shuffle(directions)
+        else:
+            if not orders:
+                orders = rng.permuted(np.tile(np.arange(4), (1024, 1)), axis=1).tolist()
+            directions = [DIRECTIONS[d] for d in orders.pop()]
 
         for dx, dy in directions:
             nx, ny = x + dx, y + dy
@@ -109,21 +243,16 @@ def quit():
 
 
 def display_maze(maze, algorithm):
+    maze = as_maze(maze)  # Legacy float grids are adapted once here
     cmap = plt.cm.get_cmap('Greens_r')  # Colormap for colors
     cmap.set_under('black')  # Set the color for the maze
 
     fig, ax = plt.subplots(figsize=(6, 6), facecolor='white')
-    ax.imshow(maze, cmap=cmap, interpolation='nearest')
+    ax.imshow(maze.grid, cmap=cmap, interpolation='nearest')
 
     # Add entry and exit points inside the maze
-    start = np.argwhere(maze == 2)[0]
-    ends = []
-    end_position_1 = np.argwhere(maze == 3.1)
-    end_position_2 = np.argwhere(maze == 3.2)
-    end_position_3 = np.argwhere(maze == 3.3)
-    ends.append(end_position_1[0])
-    ends.append(end_position_2[0])
-    ends.append(end_position_3[0])
+    start = maze.start
+    ends = list(maze.exits)
 
     # Calculate the size of the elements based on the maze size
     maze_height = maze.shape[0]  # Number of rows in the maze
@@ -137,12 +266,12 @@ def display_maze(maze, algorithm):
         ax.text(end_point[1], end_point[0], str(i + 1), color='black', fontsize=12, ha='center', va='center')
 
     # Add rough terrain in brown
-    rough_terrain = np.argwhere(maze == 4)
+    rough_terrain = np.argwhere(maze.grid == ROUGH)
     for terrain in rough_terrain:
         ax.scatter(terrain[1], terrain[0], color='brown', marker='s', s=200 * cell_size)
 
     # Add water terrain in sky blue
-    water_terrain = np.argwhere(maze == 5)
+    water_terrain = np.argwhere(maze.grid == WATER)
     for terrain in water_terrain:
         ax.scatter(terrain[1], terrain[0], color='skyblue', marker='s', s=200 * cell_size)
 
@@ -195,57 +324,10 @@ def display_maze(maze, algorithm):
         ax.scatter(step[1], step[0], color=adventurer.color, marker=adventurer.marker,
                    s=100 * cell_size)
 
-    if algorithm == 'A*':
-        path = algorithms.a_star(maze)
-        print("A* path: ")
+    if algorithm in algorithms.SOLVERS:
+        path = algorithms.get_solver(algorithm)(maze)
+        print(algorithm + " path: ")
         print(path)
-        if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
-            for step in path:
-                adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
-                adventurer.follow_path()
-                adventurer_plot.set_offsets([adventurer.y, adventurer.x])
-                quit.on_clicked(quit_game)
-                plt.draw()
-                num_steps += 1
-                trail(step)
-                plt.pause(0.2)
-            ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
-                    fontsize=12, fontweight='bold')
-    if algorithm == 'BFS':
-        path = algorithms.bfs(maze)
-        print("BFS path: ")
-        if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
-            for step in path:
-                adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
-                adventurer.follow_path()
-                adventurer_plot.set_offsets([adventurer.y, adventurer.x])
-                quit.on_clicked(quit_game)
-                plt.draw()
-                num_steps += 1
-                trail(step)
-                plt.pause(0.2)
-            ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,
-                    'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
-                    fontsize=12, fontweight='bold')
-    if algorithm == 'DFS':
-        path = algorithms.dfs(maze)
-        print("DFS path: ")
-        if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
-            for step in path:
-                adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
-                adventurer.follow_path()
-                adventurer_plot.set_offsets([adventurer.y, adventurer.x])
-                quit.on_clicked(quit_game)
-                plt.draw()
-                num_steps += 1
-                trail(step)
-                plt.pause(0.2)
-            ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,
-                    'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
-                    fontsize=12, fontweight='bold')
-    if algorithm == 'Dijkstra':
-        path = algorithms.dijkstra(maze)
-        print("Dijkstra path: ")
         if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
             for step in path:
                 adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
@@ -259,41 +341,6 @@ def display_maze(maze, algorithm):
             ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,
                     'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
                     fontsize=12, fontweight='bold')
-    if algorithm == 'UCS':
-        path = algorithms.ucs(maze)
-        print("UCS path: ")
-        if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
-            for step in path:
-                adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
-                adventurer.follow_path()
-                adventurer_plot.set_offsets([adventurer.y, adventurer.x])
-                quit.on_clicked(quit_game)
-                plt.draw()
-                num_steps += 1
-                trail(step)
-                plt.pause(0.2)
-            ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,
-                    'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
-                    fontsize=12, fontweight='bold')
-    if algorithm == 'IDDFS':
-        path = algorithms.iddfs(maze)
-        print("IDDFS path: ")
-        if algorithms.verify_path_algorithm(path, maze):  # Exclude the starting position
-            for step in path:
-                adventurer.move(step[0] - adventurer.x, step[1] - adventurer.y)
-                adventurer.follow_path()
-                adventurer_plot.set_offsets([adventurer.y, adventurer.x])
-                quit.on_clicked(quit_game)
-                plt.draw()
-                num_steps += 1
-                trail(step)
-                plt.pause(0.2)
-                ax.text(maze.shape[1] // 2, maze.shape[0] + 1.5,
-                        'Algorithm ' + algorithm + ' Number of steps: ' + str(num_steps), ha='center',
-                        fontsize=12, fontweight='bold')
-
-        if algorithm == "manual":
-            on_key(None)
 
     fig.canvas.mpl_connect('key_press_event', on_key)
 
@@ -1,4 +1,13 @@
-from maze_generation import generate_maze, display_maze
+import hashlib
+import random
+
+import numpy as np
+
+import algorithms
+from maze import Maze, as_maze, START, EXIT
+from generators import GENERATORS, get_generator
+from maze_generation import generate_maze, display_maze, carve_path, is_connected, add_terrain, \
+    stream_maze, generate_maze_file, load_maze_file, verify_path
 
 
 def test_display_maze():
@@ -9,6 +18,125 @@ def test_display_maze():
 
     # Display the maze
     print(maze)
+    assert maze.grid.dtype == np.uint8
+
+
+def test_generate_maze_matches_seeded_fixture():
+    # Digests of mazes produced by the original recursive carver for the same seeds
+    fixtures = {
+        (1234, 8, 6): "4c2451daf5be59d2fc94159118f85aa358fa3d739da7b6275f69d705bab3e22c",
+        (7, 15, 15): "17b090ead5b0de207fe3c7fe7272c86f356ea3ef9bfd594f561e20f1a6559aac",
+    }
+    for (seed, width, height), digest in fixtures.items():
+        random.seed(seed)
+        maze = generate_maze(width, height)
+        assert hashlib.sha256(maze.to_legacy().tobytes()).hexdigest() == digest
+
+
+def test_carve_path_large_maze():
+    # Far deeper than the default recursion limit; every even-index cell must be carved
+    maze = np.zeros((801, 801), dtype=float)
+    carve_path(maze, 0, 400)
+    assert (maze[::2, ::2] == 1).all()
+    # A spanning tree over the even cells has exactly one passage less than it has cells
+    assert (maze == 1).sum() == 2 * 401 * 401 - 1
+
+
+def test_generate_maze_union_find_connects_every_exit():
+    maze = generate_maze(30, 20, verify='union_find')
+    start = maze.start[::-1]
+    ends = [end[::-1] for end in maze.exits]
+    assert is_connected(maze, start, ends)
+
+    # Walling off the right-hand exit must be detected
+    x, y = ends[1]
+    maze[max(y - 1, 0):y + 2, x - 1:x + 2] = 0
+    maze[y, x] = EXIT
+    assert not is_connected(maze, start, ends)
+
+
+def test_add_terrain_densities():
+    maze = np.zeros((401, 301), dtype=float)
+    add_terrain(maze, np.random.default_rng(0), rough_density=0.0, water_density=1.0)
+    assert (maze[1::2, 1::2] == 5).all()
+    assert (maze[::2, :] == 0).all() and (maze[:, ::2] == 0).all()
+
+    first = add_terrain(np.zeros((41, 61)), np.random.default_rng(5), 0.3, 0.2)
+    second = add_terrain(np.zeros((41, 61)), np.random.default_rng(5), 0.3, 0.2)
+    assert (first == second).all()
+    assert (first == 4).any() and (first == 5).any()
+
+
+def test_registry_generators_emit_perfect_mazes():
+    for name in GENERATORS:
+        maze = generate_maze(12, 9, name, seed=11)
+        # Every even-index cell is open and joined by exactly cells - 1 passages: a spanning tree
+        cells = (maze[::2, ::2] != 0).sum()
+        passages = (maze[::2, 1::2] != 0).sum() + (maze[1::2, ::2] != 0).sum()
+        assert cells == 13 * 10 and passages == cells - 1, name
+        assert [maze[end] for end in maze.exits] == [EXIT] * 3 and maze[maze.start] == START
+        assert algorithms.verify_path_algorithm(algorithms.dijkstra(maze), maze)
+
+    try:
+        get_generator('labyrinth')
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("Unknown generator names must be rejected")
+
+
+def test_generate_maze_file_streams_a_perfect_maze(tmp_path):
+    path = tmp_path / "maze.npy"
+    written = generate_maze_file(path, 14, 11, seed=3)
+    maze = load_maze_file(path)
+
+    assert maze.shape == (23, 29) and maze.grid.dtype == np.uint8
+    assert not maze.grid.flags.owndata and not maze.grid.flags.writeable  # The read-only map, not a copy
+    assert maze.start == written.start and maze.exits == written.exits
+    scanned = as_maze(np.load(path, mmap_mode='r'))
+    assert scanned.start == maze.start and set(scanned.exits) == set(maze.exits)
+    assert not scanned.grid.flags.writeable  # Integer grids skip np.floor
+    assert (np.array(list(stream_maze(14, 11, seed=3))) == maze.grid).all()
+    cells = (maze[::2, ::2] != 0).sum()
+    passages = (maze[::2, 1::2] != 0).sum() + (maze[1::2, ::2] != 0).sum()
+    assert passages == cells - 1
+    solution = algorithms.dijkstra(maze)
+    assert algorithms.verify_path_algorithm(solution, maze)
+
+
+def test_maze_legacy_adapter_round_trip():
+    random.seed(3)
+    maze = generate_maze(9, 7)
+    legacy = maze.to_legacy()
+    assert legacy.dtype == float
+    assert [legacy[end] for end in maze.exits] == [3.1, 3.2, 3.3]
+
+    adapted = Maze.from_legacy(legacy)
+    assert adapted.start == maze.start and adapted.exits == maze.exits
+    assert (adapted.grid == maze.grid).all()
+    assert as_maze(maze) is maze
+
+    # np.array copies like it does for an ndarray, and comparisons give masks like the legacy arrays
+    copy = np.array(maze)
+    copy[maze.start] = 9
+    assert maze[maze.start] == START and np.asarray(maze) is maze.grid
+    assert ((maze == START) == (maze.grid == START)).all() and (maze != 0).sum() == (maze.grid != 0).sum()
+    assert (maze >= 4).sum() == (maze.grid >= 4).sum() and (maze == maze).all()
+
+
+def test_seeded_generation_ignores_the_random_module():
+    for name in GENERATORS:
+        random.seed(1)
+        first = generate_maze(16, 12, name, seed=np.random.default_rng(8))
+        random.seed(2)
+        second = generate_maze(16, 12, name, seed=8)
+        assert (first.grid == second.grid).all(), name
+        assert first.start == second.start and first.exits == second.exits, name
+
+    maze = generate_maze(16, 12, seed=4).grid
+    maze[maze > 1] = 1  # verify_path only walks plain path cells
+    start, end = (0, 2), (32, 24)
+    assert verify_path(maze, start, end, np.random.default_rng(0)) == verify_path(maze, start, end)
 
 
 if __name__ == "__main__":
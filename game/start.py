@@ -2,6 +2,8 @@ import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox
 from maze_generation import display_maze, generate_maze, quit
+from generators import GENERATORS
+from algorithms import SOLVERS
 import sys
 
 global width_global
@@ -10,6 +12,8 @@ global length_global
 length_global = 10
 global algorithm_global
 algorithm_global = 6
+global generator_global
+generator_global = 'dfs'
 
 class StartGamePage(tk.Frame):
     def __init__(self, parent, start_game_callback):
@@ -44,10 +48,18 @@ class StartGamePage(tk.Frame):
         self.algorithm_var = tk.StringVar(self)
         self.algorithm_var.set("Manual")
 
-        self.algorithm_menu = tk.OptionMenu(self, self.algorithm_var, "Manual", "A*", "BFS", "DFS", "UCS",
-                                            "Dijkstra","IDDFS")
+        self.algorithm_menu = tk.OptionMenu(self, self.algorithm_var, "Manual", *SOLVERS)
         self.algorithm_menu.pack()
 
+        self.generator_label = tk.Label(self, text="Generator:", font=("Arial", 12))
+        self.generator_label.pack()
+
+        self.generator_var = tk.StringVar(self)
+        self.generator_var.set(generator_global)
+
+        self.generator_menu = tk.OptionMenu(self, self.generator_var, *GENERATORS)
+        self.generator_menu.pack()
+
         start_button = ttk.Button(self, text="Start Game", command=self.start_game)
         start_button.pack(pady=(20, 10))
 
@@ -61,6 +73,7 @@ class StartGamePage(tk.Frame):
         width = self.width_entry.get()
         height = self.height_entry.get()
         algorithm = self.algorithm_var.get()
+        generator = self.generator_var.get()
 
         if not width.isdigit() or not height.isdigit():
             messagebox.showerror("Input Error", "Width and height must be numeric values.")
@@ -70,7 +83,7 @@ class StartGamePage(tk.Frame):
         else:
             width = int(width)
             height = int(height)
-            self.start_game_callback(width, height, algorithm)
+            self.start_game_callback(width, height, algorithm, generator)
 
     def end_game(self):
         start_page.destroy()
@@ -79,26 +92,28 @@ class StartGamePage(tk.Frame):
 
     def shuffle_game(self):
         quit()
-        test_display_maze(width_global,length_global,algorithm_global)
+        test_display_maze(width_global, length_global, algorithm_global, generator_global)
 
 
-def start_game_callback(width, height, algorithm):
+def start_game_callback(width, height, algorithm, generator):
     start_page.width_entry.delete(0, tk.END)
     start_page.height_entry.delete(0, tk.END)
     print(f"Width: {width}")
     print(f"Height: {height}")
-    global width_global, length_global, algorithm_global
+    print(f"Generator: {generator}")
+    global width_global, length_global, algorithm_global, generator_global
     width_global = width
     length_global = height
     algorithm_global = algorithm
-    test_display_maze(width, height, algorithm)
+    generator_global = generator
+    test_display_maze(width, height, algorithm, generator)
 
 
-def test_display_maze(width, height, algorithm):
-    # Generate a maze using your desired width and height
+def test_display_maze(width, height, algorithm, generator='dfs'):
+    # Generate a maze using your desired width, height and generator
     width = width
     height = height
-    maze = generate_maze(width, height)
+    maze = generate_maze(width, height, generator)
     # Display the maze
     display_maze(maze, algorithm)
 